@@ -43,6 +43,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "tournament.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -56,7 +57,7 @@ ROOT_URLCONF = "kettlebell_app.urls"
 
 TEMPLATES = [
     {
-        "BACKEND": "django.template.backends.django.DjangoTemplates",
+        "BACKEND": "tournament.metrics.InstrumentedDjangoTemplates",
         "DIRS": [],
         "APP_DIRS": True,
         "OPTIONS": {
@@ -73,7 +74,91 @@ TEMPLATES = [
 WSGI_APPLICATION = "kettlebell_app.wsgi.application"
 ASGI_APPLICATION = "kettlebell_app.asgi.application"
 
+# The in-memory layer only reaches WebSocket clients of the process that saved
+# the results: saves made by other processes (gunicorn workers, the
+# recompute_rankings worker, management commands) are never pushed. It is only
+# fit for runserver: deployments set TOURNAMENT_SHARED_CHANNEL_LAYER and
+# configure a layer shared by all processes (see settings.prod), or the
+# tournament.W001 check warns.
 CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
+TOURNAMENT_SHARED_CHANNEL_LAYER = False
+
+# Cache
+# https://docs.djangoproject.com/en/4.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "kettlebell_app",
+    }
+}
+
+# Rendered category results pages and their context are cached per category in
+# this cache alias and invalidated whenever the category's leaderboard changes.
+TOURNAMENT_RESULTS_CACHE = "default"
+TOURNAMENT_RESULTS_CACHE_TIMEOUT = 300
+
+# Rankings
+# With TOURNAMENT_DEFER_RANKINGS enabled Player saves only mark their categories
+# dirty; run `manage.py recompute_rankings` to recompute them in the background,
+# at most once per TOURNAMENT_RANKINGS_WINDOW seconds per category.
+
+TOURNAMENT_DEFER_RANKINGS = False
+TOURNAMENT_RANKINGS_WINDOW = 2.0
+
+# Streaming results exports (`/export/` and `manage.py export_results`) read
+# players in chunks of this size.
+TOURNAMENT_EXPORT_CHUNK_SIZE = 200
+
+# Start lists are balanced using these minutes per athlete and discipline,
+# overriding the defaults in tournament.scheduling.DISCIPLINE_MINUTES.
+TOURNAMENT_DISCIPLINE_MINUTES = {}
+
+# Metrics
+# MetricsMiddleware records per-view latency, SQL queries, DB and template time
+# of the current process. /metrics/ serves them in the Prometheus text format to
+# staff users and to scrapers sending the header
+# "Authorization: Bearer <TOURNAMENT_METRICS_TOKEN>".
+# A TOURNAMENT_PROFILE_SAMPLE_RATE share of requests runs under cProfile and the
+# TOURNAMENT_PROFILE_KEEP slowest of them are dumped to TOURNAMENT_PROFILE_DIR.
+
+TOURNAMENT_METRICS_TOKEN = None
+TOURNAMENT_PROFILE_SAMPLE_RATE = 0
+TOURNAMENT_PROFILE_KEEP = 20
+TOURNAMENT_PROFILE_DIR = BASE_DIR.parent / "profiles"
+
+# Backups
+# `manage.py backup_database` copies the SQLite database into DBBACKUP_PATH
+# every TOURNAMENT_BACKUP_INTERVAL seconds with the online backup API, in steps
+# of TOURNAMENT_BACKUP_PAGES pages with TOURNAMENT_BACKUP_PAUSE seconds between
+# them. It keeps the TOURNAMENT_BACKUP_KEEP_LAST newest backups plus the newest
+# of each of the last TOURNAMENT_BACKUP_KEEP_HOURLY hours and
+# TOURNAMENT_BACKUP_KEEP_DAILY days. The last backup's age and duration are
+# served at /metrics/.
+
+DBBACKUP_PATH = BASE_DIR.parent / "dbbackup"
+TOURNAMENT_BACKUP_INTERVAL = 60
+TOURNAMENT_BACKUP_PAGES = 256
+TOURNAMENT_BACKUP_PAUSE = 0.005
+TOURNAMENT_BACKUP_KEEP_LAST = 60
+TOURNAMENT_BACKUP_KEEP_HOURLY = 24
+TOURNAMENT_BACKUP_KEEP_DAILY = 14
+
+# SQLite
+# Pragmas run on every new SQLite connection (tournament.signals.configure_sqlite).
+# WAL lets spectators read while a scorer writes, synchronous=NORMAL is safe in
+# WAL mode, and busy_timeout makes writers queue for the lock for up to 5 s
+# instead of failing with "database is locked".
+# `manage.py benchmark_contention` compares them with SQLite's defaults.
+
+TOURNAMENT_SQLITE_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,  # in KiB: 20 MB per connection
+    "mmap_size": 256 * 1024 * 1024,
+    "temp_store": "MEMORY",
+}
 
 # Database
 # https://docs.djangoproject.com/en/4.2/ref/settings/#databases
@@ -1,3 +1,5 @@
+import os
+
 from kettlebell_app.settings.base import *
 
 DEBUG = False
@@ -9,11 +11,44 @@ CSRF_TRUSTED_ORIGINS = ["https://ppkettlebell.toadres.pl"]
 
 LOG_PATH = "../logs"
 DBBACKUP_PATH = "../dbbackup"
+CACHE_PATH = "../cache"
+TOURNAMENT_PROFILE_DIR = "../profiles"
+TOURNAMENT_METRICS_TOKEN = os.environ.get("TOURNAMENT_METRICS_TOKEN")
+
+# Shared by all gunicorn workers, so invalidation in one worker reaches the others
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+        "LOCATION": CACHE_PATH,
+    }
+}
+
+# Live results are saved by gunicorn workers and the recompute_rankings worker
+# but pushed from the ASGI process, so they need a layer all processes share
+CHANNEL_LAYERS = {
+    "default": {
+        "BACKEND": "channels_redis.core.RedisChannelLayer",
+        "CONFIG": {
+            "hosts": [os.environ.get("REDIS_URL", "redis://127.0.0.1:6379/0")],
+        },
+    }
+}
+TOURNAMENT_SHARED_CHANNEL_LAYER = True
 
+# IMMEDIATE transactions take the write lock at BEGIN and wait for it (see
+# TOURNAMENT_SQLITE_PRAGMAS), instead of failing with "database is locked" when a
+# transaction that started by reading tries to write. The trade-off: every
+# atomic() block takes the write lock, read-only ones included (e.g. admin
+# change-form GETs), so long reads must not run inside atomic();
+# tournament.snapshots uses a deferred read transaction instead. Workers keep
+# their connection (and its page cache) across requests.
 DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": "db.sqlite3",
+        "CONN_MAX_AGE": 600,
+        "CONN_HEALTH_CHECKS": True,
+        "OPTIONS": {"transaction_mode": "IMMEDIATE"},
     }
 }
 
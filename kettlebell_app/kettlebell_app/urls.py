@@ -18,6 +18,6 @@ from django.contrib import admin
 from django.urls import include, path
 
 urlpatterns = [
-    path("", include("tournament.urls")),
     path("admin/", admin.site.urls),
+    path("", include("tournament.urls")),
 ]
@@ -2,20 +2,7 @@ from django import forms
 from django.contrib import admin
 from import_export.admin import ImportExportModelAdmin
 
-from .models import (
-    AVAILABLE_DISCIPLINES,
-    BestKBSquatResult,
-    BestSeeSawPressResult,
-    Category,
-    KBSquatResult,
-    OverallResult,
-    PistolSquatResult,
-    Player,
-    SeeSawPressResult,
-    SnatchResult,
-    SportClub,
-    TGUResult,
-)
+from .models import AVAILABLE_DISCIPLINES, Category, Player
 from .resources import PlayerExportResource, PlayerImportResource
 
 
@@ -62,6 +49,7 @@ class PlayerAdmin(ImportExportModelAdmin):
         "tiebreak",
     )
     list_filter = ("club", "categories", "tiebreak")
+    list_select_related = ("club",)
     search_fields = ("name", "surname", "club__name", "categories__name")
 
     fieldsets = (
@@ -103,33 +91,35 @@ class PlayerAdmin(ImportExportModelAdmin):
         ),
     )
 
+    def get_queryset(self, request):
+        return super().get_queryset(request).prefetch_related("categories")
+
     def get_categories(self, obj):
         return ", ".join([category.name for category in obj.categories.all()])
 
     get_categories.short_description = "Kategoria"
 
     def get_tgu_max(self, obj):
-        return max(obj.tgu_weight_1 or 0, obj.tgu_weight_2 or 0, obj.tgu_weight_3 or 0)
+        return obj.tgu_result
 
     get_tgu_max.short_description = "TGU Max"
+    get_tgu_max.admin_order_field = "tgu_result"
 
     def get_best_see_saw_press_left(self, obj):
-        best_result = BestSeeSawPressResult.objects.filter(player=obj).first()
-        return best_result.best_left if best_result else 0
+        return max(left for left, _ in obj.get_see_saw_press_attempts())
 
     get_best_see_saw_press_left.short_description = "See Saw Press Left (Best)"
 
     def get_best_see_saw_press_right(self, obj):
-        best_result = BestSeeSawPressResult.objects.filter(player=obj).first()
-        return best_result.best_right if best_result else 0
+        return max(right for _, right in obj.get_see_saw_press_attempts())
 
     get_best_see_saw_press_right.short_description = "See Saw Press Right (Best)"
 
     def get_best_kb_squat(self, obj):
-        best_result = BestKBSquatResult.objects.filter(player=obj).first()
-        return best_result.best_result if best_result else 0
+        return obj.kb_squat_result
 
     get_best_kb_squat.short_description = "KB Squat (Best)"
+    get_best_kb_squat.admin_order_field = "kb_squat_result"
 
     def get_import_resource_class(self):
         return PlayerImportResource
@@ -137,24 +127,6 @@ class PlayerAdmin(ImportExportModelAdmin):
     def get_export_resource_class(self):
         return PlayerExportResource
 
-    def save_model(self, request, obj, form, change):
-        super().save_model(request, obj, form, change)
-
-        # Update or create TGUResult
-        tgu_result, created = TGUResult.objects.get_or_create(player=obj)
-        tgu_result.result_1 = obj.tgu_weight_1 or 0
-        tgu_result.result_2 = obj.tgu_weight_2 or 0
-        tgu_result.result_3 = obj.tgu_weight_3 or 0
-        tgu_result.save()
-
-        pistol_squat_result, created = PistolSquatResult.objects.get_or_create(
-            player=obj
-        )
-        pistol_squat_result.result_1 = obj.pistol_squat_weight_1 or 0
-        pistol_squat_result.result_2 = obj.pistol_squat_weight_2 or 0
-        pistol_squat_result.result_3 = obj.pistol_squat_weight_3 or 0
-        pistol_squat_result.save()
-
 
 # @admin.register(SportClub)
 # class SportClubAdmin(admin.ModelAdmin):
@@ -199,7 +171,7 @@ class PlayerAdmin(ImportExportModelAdmin):
 #     def get_bw_percentage(self, obj):
 #         return f"{obj.calculate_bw_percentage():.2f}%"
 
-    # get_bw_percentage.short_description = "%BW"
+# get_bw_percentage.short_description = "%BW"
 
 
 # @admin.register(TGUResult)
@@ -9,4 +9,4 @@ class TournamentAppConfig(AppConfig):
 
     def ready(self):
         # Importuj sygnały
-        pass
+        from . import checks, signals  # noqa: F401
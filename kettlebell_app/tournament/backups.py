@@ -0,0 +1,158 @@
+"""Online backups of the SQLite database into ``DBBACKUP_PATH``.
+
+The copy uses SQLite's online backup API a few pages at a time, so the
+database is only locked for one short step at a time and scorers keep
+saving while a backup runs. The outcome of the last run is kept in a
+status file next to the backups, which ``/metrics/`` reads.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from contextlib import closing
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+
+STATUS_FILE = "last_backup.json"
+
+_timestamp_re = re.compile(r"-(\d{8}-\d{6})\.sqlite3$")
+
+
+def get_backup_dir():
+    return Path(settings.DBBACKUP_PATH)
+
+
+def get_database_path(alias="default"):
+    database = connections[alias].settings_dict
+    if database["ENGINE"] != "django.db.backends.sqlite3":
+        raise ValueError(f"Database '{alias}' is not SQLite")
+    return Path(database["NAME"])
+
+
+def backup_database(alias="default", pages=None, pause=None):
+    """Copy the database into a new timestamped file in ``DBBACKUP_PATH``.
+
+    Each step copies ``pages`` pages and then waits ``pause`` seconds, so
+    writers are never blocked for longer than one step. The copy is written
+    under a temporary name and checked before it is moved into place.
+    Returns the status stored for ``/metrics/``.
+    """
+    if pages is None:
+        pages = getattr(settings, "TOURNAMENT_BACKUP_PAGES", 256)
+    if pause is None:
+        pause = getattr(settings, "TOURNAMENT_BACKUP_PAUSE", 0.005)
+    source_path = get_database_path(alias)
+    directory = get_backup_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    now = datetime.now(timezone.utc)
+    path = directory / f"{source_path.stem}-{now:%Y%m%d-%H%M%S}.sqlite3"
+    partial = path.with_name(f".{path.name}.partial")
+
+    start = time.perf_counter()
+    try:
+        copy_database(source_path, partial, pages, pause)
+        os.replace(partial, path)
+    except Exception as e:
+        partial.unlink(missing_ok=True)
+        status = read_backup_status() or {}
+        status.update(
+            failures=status.get("failures", 0) + 1,
+            last_failure=time.time(),
+            last_error=str(e),
+        )
+        _write_status(status)
+        raise
+
+    status = {
+        "path": str(path),
+        "finished_at": time.time(),
+        "seconds": time.perf_counter() - start,
+        "size": path.stat().st_size,
+        "failures": 0,
+    }
+    _write_status(status)
+    return status
+
+
+def copy_database(source_path, target_path, pages, pause):
+    """Copy an SQLite database with the online backup API and check the copy."""
+    with (
+        # mode=rw: a missing database is an error, not a new empty file
+        closing(
+            sqlite3.connect(f"{Path(source_path).resolve().as_uri()}?mode=rw", uri=True)
+        ) as source,
+        closing(sqlite3.connect(target_path)) as target,
+    ):
+        source.backup(target, pages=pages, progress=lambda *args: time.sleep(pause))
+        (check,) = target.execute("PRAGMA quick_check").fetchone()
+        if check != "ok":
+            raise sqlite3.DatabaseError(f"Backup check failed: {check}")
+
+
+def read_backup_status():
+    try:
+        with open(get_backup_dir() / STATUS_FILE, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _write_status(status):
+    directory = get_backup_dir()
+    directory.mkdir(parents=True, exist_ok=True)
+    partial = directory / f".{STATUS_FILE}.partial"
+    partial.write_text(json.dumps(status), encoding="utf-8")
+    os.replace(partial, directory / STATUS_FILE)
+
+
+def list_backups(alias="default"):
+    """``(timestamp, path)`` of the database's backups, newest first."""
+    stem = get_database_path(alias).stem
+    backups = []
+    for path in get_backup_dir().glob(f"{stem}-*.sqlite3"):
+        match = _timestamp_re.search(path.name)
+        if match:
+            taken = datetime.strptime(match[1], "%Y%m%d-%H%M%S")
+            backups.append((taken.replace(tzinfo=timezone.utc).timestamp(), path))
+    return sorted(backups, reverse=True)
+
+
+def select_backups_to_keep(backups, keep_last, keep_hourly, keep_daily):
+    """Paths to keep from ``backups`` (``(timestamp, path)``, newest first).
+
+    The ``keep_last`` newest backups are kept, plus the newest backup of
+    each of the last ``keep_hourly`` hours and ``keep_daily`` days that
+    have one, so older history thins out instead of disappearing.
+    """
+    keep = {path for _, path in backups[:keep_last]}
+    for seconds, count in ((3600, keep_hourly), (86400, keep_daily)):
+        buckets = set()
+        for timestamp, path in backups:
+            bucket = timestamp // seconds
+            if bucket in buckets:
+                continue
+            if len(buckets) >= count:
+                break
+            buckets.add(bucket)
+            keep.add(path)
+    return keep
+
+
+def rotate_backups(alias="default"):
+    """Delete backups outside the retention; returns the deleted paths."""
+    backups = list_backups(alias)
+    keep = select_backups_to_keep(
+        backups,
+        keep_last=getattr(settings, "TOURNAMENT_BACKUP_KEEP_LAST", 60),
+        keep_hourly=getattr(settings, "TOURNAMENT_BACKUP_KEEP_HOURLY", 24),
+        keep_daily=getattr(settings, "TOURNAMENT_BACKUP_KEEP_DAILY", 14),
+    )
+    deleted = [path for _, path in backups if path not in keep]
+    for path in deleted:
+        path.unlink(missing_ok=True)
+    return deleted
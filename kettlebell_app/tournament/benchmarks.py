@@ -0,0 +1,404 @@
+import math
+import platform
+import random
+import statistics
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+
+import django
+import tablib
+import yaml
+from django.conf import settings
+from django.db import connection, transaction
+from django.test import RequestFactory
+from django.test.utils import CaptureQueriesContext, override_settings
+
+from . import views
+from .exports import iter_export
+from .models import (
+    AVAILABLE_DISCIPLINES,
+    Category,
+    Player,
+    SportClub,
+    category_slug,
+    update_overall_results,
+)
+from .resources import PlayerImportResource
+
+DEFAULT_SIZES = [100, 1000, 10000]
+
+KETTLEBELLS = [8, 10, 12, 14, 16, 20, 24, 28, 32, 36, 40, 44, 48]
+
+# Typical heaviest kettlebell of a lift as a share of the body weight
+LIFT_RATIOS = {
+    "snatch": (0.2, 0.35),
+    "tgu": (0.25, 0.5),
+    "see_saw_press": (0.15, 0.3),
+    "kb_squat": (0.25, 0.5),
+    "pistol_squat": (0.2, 0.45),
+}
+MISSED_ATTEMPT = 0.15
+
+# (name fragment, body weight range) of the first matching category
+BODY_WEIGHTS = [
+    ("do_65kg", (50, 65)),
+    ("powyżej_65kg", (65.1, 95)),
+    ("do_85kg", (62, 85)),
+    ("powyżej_85kg", (85.1, 125)),
+    ("kobiety", (50, 90)),
+    ("bochnianka", (50, 90)),
+]
+DEFAULT_BODY_WEIGHT = (62, 115)
+
+
+@dataclass
+class TournamentProfile:
+    """Shape of a real tournament that synthetic ones are generated from."""
+
+    categories: list  # (name, disciplines) pairs
+    category_sets: list  # indices into ``categories`` of each athlete
+    club_sizes: list  # athletes per club
+
+    @classmethod
+    def from_fixture(cls, path):
+        with open(path, encoding="utf-8") as fixture:
+            objects = yaml.safe_load(fixture)
+        categories = [obj for obj in objects if obj["model"] == "tournament.category"]
+        index = {obj["pk"]: i for i, obj in enumerate(categories)}
+        players = [
+            obj["fields"] for obj in objects if obj["model"] == "tournament.player"
+        ]
+        return cls(
+            categories=[
+                (obj["fields"]["name"], obj["fields"]["disciplines"])
+                for obj in categories
+            ],
+            category_sets=[
+                [index[pk] for pk in player["categories"] if pk in index]
+                for player in players
+            ],
+            club_sizes=sorted(Counter(player["club"] for player in players).values()),
+        )
+
+    @classmethod
+    def default(cls):
+        disciplines = [discipline for discipline, _ in AVAILABLE_DISCIPLINES]
+        return cls(
+            categories=[(f"Kategoria_{i}", disciplines) for i in range(12)],
+            category_sets=[[i] for i in range(12)],
+            club_sizes=[1, 2, 3],
+        )
+
+
+def load_profile(path=None):
+    """Profile of ``path`` (``fixtures/dump.yaml`` by default), if it exists."""
+    path = path or settings.BASE_DIR.parent / "fixtures" / "dump.yaml"
+    try:
+        return TournamentProfile.from_fixture(path)
+    except FileNotFoundError:
+        return TournamentProfile.default()
+
+
+def _body_weight(rng, category_name):
+    name = category_name.lower()
+    for fragment, (low, high) in BODY_WEIGHTS:
+        if fragment in name:
+            return round(rng.uniform(low, high), 1)
+    return round(rng.uniform(*DEFAULT_BODY_WEIGHT), 1)
+
+
+def _attempts(rng, body_weight, lift):
+    """Three ascending attempts up to a typical kettlebell, some of them missed."""
+    low, high = LIFT_RATIOS[lift]
+    target = body_weight * rng.uniform(low, high)
+    best = max((i for i, bell in enumerate(KETTLEBELLS) if bell <= target), default=0)
+    return [
+        0.0 if rng.random() < MISSED_ATTEMPT else float(KETTLEBELLS[max(best - i, 0)])
+        for i in (2, 1, 0)
+    ]
+
+
+def _fill_attempts(rng, player):
+    player.snatch_kettlebell_weight = max(_attempts(rng, player.weight, "snatch"))
+    player.snatch_repetitions = rng.randint(40, 200)
+    for prefix, lift in (
+        ("tgu_weight", "tgu"),
+        ("pistol_squat_weight", "pistol_squat"),
+    ):
+        for attempt, weight in enumerate(_attempts(rng, player.weight, lift), 1):
+            setattr(player, f"{prefix}_{attempt}", weight)
+    for lift in ("see_saw_press", "kb_squat"):
+        for side in ("left", "right"):
+            for attempt, weight in enumerate(_attempts(rng, player.weight, lift), 1):
+                setattr(player, f"{lift}_weight_{side}_{attempt}", weight)
+
+
+def _category_names(profile, count, prefix):
+    names = []
+    for i in range(count):
+        block, index = divmod(i, len(profile.categories))
+        name = f"{prefix}_{profile.categories[index][0]}"
+        names.append(f"{name}_{block}" if block else name)
+    return names
+
+
+def generate_tournament(
+    players=5000, categories=None, clubs=None, seed=0, profile=None, prefix="Benchmark"
+):
+    """Fill the database with a synthetic tournament and rank every category.
+
+    Categories, the combinations athletes enter and club sizes follow
+    ``profile``; attempts are drawn around typical kettlebell lifts. Meant
+    for benchmarks: callers run it inside a transaction they roll back.
+    Returns the created categories, in profile order.
+    """
+    rng = random.Random(seed)
+    profile = profile or TournamentProfile.default()
+    template_count = len(profile.categories)
+    categories = categories or template_count
+    clubs = clubs or max(1, round(players / statistics.mean(profile.club_sizes)))
+    club_weights = [
+        profile.club_sizes[i % len(profile.club_sizes)] for i in range(clubs)
+    ]
+
+    with transaction.atomic():
+        club_objs = SportClub.objects.bulk_create(
+            [SportClub(name=f"{prefix} Club {i}") for i in range(clubs)]
+        )
+        taken = set(Category.objects.values_list("slug", flat=True))
+        category_objs = []
+        for i, name in enumerate(_category_names(profile, categories, prefix)):
+            slug = category_slug(name, taken)
+            taken.add(slug)
+            category_objs.append(
+                Category(
+                    name=name,
+                    slug=slug,
+                    disciplines=profile.categories[i % template_count][1],
+                )
+            )
+        category_objs = Category.objects.bulk_create(category_objs)
+
+        # Larger tournaments repeat the profile's categories in blocks
+        blocks = math.ceil(categories / template_count)
+        player_objs, player_categories = [], []
+        for i in range(players):
+            offset = rng.randrange(blocks) * template_count
+            indices = [
+                index + offset
+                for index in rng.choice(profile.category_sets)
+                if index + offset < categories
+            ] or [rng.randrange(categories)]
+            player = Player(
+                name=f"Imię{i}",
+                surname=f"Nazwisko{i}",
+                weight=_body_weight(rng, category_objs[indices[0]].name),
+                club=rng.choices(club_objs, weights=club_weights)[0],
+                tiebreak=rng.random() < 0.1,
+            )
+            _fill_attempts(rng, player)
+            player_objs.append(player)
+            player_categories.append(indices)
+        player_objs = Player.objects.bulk_create(player_objs, batch_size=500)
+
+        through = Player.categories.through
+        through.objects.bulk_create(
+            [
+                through(player_id=player.pk, category_id=category_objs[index].pk)
+                for player, indices in zip(player_objs, player_categories)
+                for index in indices
+            ],
+            batch_size=1000,
+        )
+
+        for category in category_objs:
+            update_overall_results(category)
+    return category_objs
+
+
+@dataclass
+class BenchmarkContext:
+    """The generated tournament a benchmark size runs against."""
+
+    athletes: int
+    categories: list
+    rng: random.Random
+    category: Category = None
+    player: Player = None
+    clubs: list = field(default_factory=list)
+
+    def __post_init__(self):
+        # The largest category with a results page is the one timed
+        counts = {category: category.results.count() for category in self.categories}
+        self.category = max(
+            (c for c in self.categories if c.disciplines), key=counts.get
+        )
+        self.player = Player.objects.filter(categories=self.category).first()
+        self.clubs = list(SportClub.objects.filter(player__isnull=False).distinct())
+
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    def register(func):
+        BENCHMARKS[name] = func
+        return func
+
+    return register
+
+
+@benchmark("player_save")
+def bench_player_save(context, round_number):
+    player = context.player
+    player.tgu_weight_1 = float(KETTLEBELLS[round_number % len(KETTLEBELLS)])
+    player.save()
+
+
+@benchmark("update_overall_results")
+def bench_update_overall_results(context, round_number):
+    update_overall_results(context.category)
+
+
+@benchmark("calculate_category_results")
+def bench_calculate_category_results(context, round_number):
+    # A cold cache: the page is rendered from the stored leaderboard
+    views.results_cache._cache().clear()
+    request = RequestFactory().get("/")
+    views.calculate_category_results(request, context.category.slug)
+
+
+@benchmark("generate_start_list")
+def bench_generate_start_list(context, round_number):
+    request = RequestFactory().post(
+        "/generate_start_list/", {"category": context.category.name, "stations": 4}
+    )
+    views.generate_start_list(request)
+
+
+@benchmark("import")
+def bench_import(context, round_number):
+    names = [category.name for category in context.categories]
+    dataset = tablib.Dataset(headers=["Imię", "Nazwisko", "Klub", "Kategoria"])
+    for i in range(context.athletes):
+        dataset.append(
+            (
+                f"Import{round_number}",
+                f"Zawodnik{i}",
+                context.rng.choice(context.clubs).name,
+                context.rng.choice(names),
+            )
+        )
+    PlayerImportResource().import_data(dataset, dry_run=False, raise_errors=True)
+
+
+@benchmark("export")
+def bench_export(context, round_number):
+    for _ in iter_export("csv", context.categories):
+        pass
+
+
+def _stats(timings):
+    return {
+        "min": min(timings),
+        "max": max(timings),
+        "mean": statistics.mean(timings),
+        "median": statistics.median(timings),
+        "stddev": statistics.stdev(timings) if len(timings) > 1 else 0.0,
+        "rounds": len(timings),
+    }
+
+
+def _measure(func, context, rounds):
+    timings, queries = [], []
+    for round_number in range(rounds):
+        with CaptureQueriesContext(connection) as captured:
+            start = time.perf_counter()
+            func(context, round_number)
+            timings.append(time.perf_counter() - start)
+        queries.append(len(captured))
+    return _stats(timings), max(queries)
+
+
+def run_benchmarks(sizes=None, rounds=3, seed=0, profile=None, names=None, log=None):
+    """Time the hot paths on synthetic tournaments of each size in ``sizes``.
+
+    Every size is generated and measured inside a transaction that is rolled
+    back, with results pages cached in a private in-memory cache. Returns a
+    report in the JSON layout of pytest-benchmark (times in seconds).
+    """
+    sizes = sizes or DEFAULT_SIZES
+    names = names or list(BENCHMARKS)
+    profile = profile or load_profile()
+    caches = {
+        **settings.CACHES,
+        "tournament-benchmark": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "tournament-benchmark",
+        },
+    }
+    report = {
+        "machine_info": {
+            "python_version": platform.python_version(),
+            "django_version": django.get_version(),
+            "database": connection.vendor,
+            "platform": platform.platform(),
+            "defer_rankings": getattr(settings, "TOURNAMENT_DEFER_RANKINGS", False),
+        },
+        "datetime": datetime.now(timezone.utc).isoformat(),
+        "benchmarks": [],
+    }
+    with override_settings(
+        CACHES=caches, TOURNAMENT_RESULTS_CACHE="tournament-benchmark"
+    ):
+        for athletes in sizes:
+            with transaction.atomic():
+                if log:
+                    log(f"Generowanie turnieju: {athletes} zawodników")
+                categories = generate_tournament(
+                    players=athletes, seed=seed, profile=profile
+                )
+                context = BenchmarkContext(athletes, categories, random.Random(seed))
+                for name in names:
+                    if log:
+                        log(f"  {name}")
+                    stats, queries = _measure(BENCHMARKS[name], context, rounds)
+                    report["benchmarks"].append(
+                        {
+                            "group": f"{athletes} athletes",
+                            "name": f"{name}[{athletes}]",
+                            "fullname": name,
+                            "params": {"athletes": athletes},
+                            "stats": stats,
+                            "extra_info": {"queries": queries},
+                        }
+                    )
+                transaction.set_rollback(True)
+    return report
+
+
+def compare_reports(baseline, report, threshold=0.25):
+    """Describe benchmarks of ``report`` that regressed against ``baseline``.
+
+    A benchmark regresses when its median time grows by more than
+    ``threshold`` or when it runs more queries.
+    """
+    previous = {bench["name"]: bench for bench in baseline["benchmarks"]}
+    regressions = []
+    for bench in report["benchmarks"]:
+        old = previous.get(bench["name"])
+        if old is None:
+            continue
+        old_median, median = old["stats"]["median"], bench["stats"]["median"]
+        if median > old_median * (1 + threshold):
+            regressions.append(
+                f"{bench['name']}: mediana {old_median * 1000:.1f} ms "
+                f"-> {median * 1000:.1f} ms"
+            )
+        old_queries = old["extra_info"]["queries"]
+        queries = bench["extra_info"]["queries"]
+        if queries > old_queries:
+            regressions.append(f"{bench['name']}: zapytania {old_queries} -> {queries}")
+    return regressions
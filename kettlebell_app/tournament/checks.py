@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+IN_MEMORY_LAYER = "channels.layers.InMemoryChannelLayer"
+
+
+@register()
+def check_channel_layer(app_configs, **kwargs):
+    """Deployments with several processes need a channel layer they all share."""
+    if not getattr(settings, "TOURNAMENT_SHARED_CHANNEL_LAYER", False):
+        return []
+    layers = getattr(settings, "CHANNEL_LAYERS", {})
+    if layers.get("default", {}).get("BACKEND") != IN_MEMORY_LAYER:
+        return []
+    return [
+        Warning(
+            "The in-memory channel layer only delivers live results saved by the "
+            "process serving the WebSocket.",
+            hint="Configure a layer shared by all processes, e.g. "
+            "channels_redis.core.RedisChannelLayer (see settings.prod).",
+            obj="CHANNEL_LAYERS",
+            id="tournament.W001",
+        )
+    ]
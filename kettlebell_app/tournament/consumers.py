@@ -1,34 +1,101 @@
 import json
 
+from asgiref.sync import async_to_sync
+from channels.db import database_sync_to_async
 from channels.generic.websocket import AsyncWebsocketConsumer
+from channels.layers import get_channel_layer
+
+from .leaderboards import get_category_leaderboard
+from .models import Category
+
+
+def results_group_name(category_slug):
+    return f"results_{category_slug}"
+
+
+def leaderboard_message(leaderboard):
+    return {
+        "type": "leaderboard",
+        "category": leaderboard.category.name,
+        "version": leaderboard.version,
+        "data": leaderboard.data,
+    }
+
+
+def patch_message(leaderboard):
+    return {
+        "type": "patch",
+        "category": leaderboard.category.name,
+        "version": leaderboard.version,
+        "base_version": leaderboard.version - 1,
+        "patch": leaderboard.patch,
+    }
+
+
+def broadcast_leaderboard_patch(leaderboard):
+    """Push the changes of a rebuilt leaderboard to clients watching its category.
+
+    Clients whose version differs from ``base_version`` missed an update and
+    ask for a full snapshot instead of applying the patch.
+    """
+    channel_layer = get_channel_layer()
+    if channel_layer is None:
+        return
+    async_to_sync(channel_layer.group_send)(
+        results_group_name(leaderboard.category.slug),
+        {"type": "results_update", "message": patch_message(leaderboard)},
+    )
 
 
 class ResultsConsumer(AsyncWebsocketConsumer):
     async def connect(self):
-        self.room_group_name = "results_amator_kobiety_do_65kg"
+        self.category_slug = self.scope["url_route"]["kwargs"]["category_slug"]
+        self.room_group_name = results_group_name(self.category_slug)
+
+        message = await self.get_leaderboard_message()
+        if message is None:
+            await self.close()
+            return
 
         # Join room group
         await self.channel_layer.group_add(self.room_group_name, self.channel_name)
 
         await self.accept()
+        await self.send(text_data=json.dumps(message))
 
     async def disconnect(self, close_code):
         # Leave room group
         await self.channel_layer.group_discard(self.room_group_name, self.channel_name)
 
     # Receive message from WebSocket
-    async def receive(self, text_data):
-        text_data_json = json.loads(text_data)
-        message = text_data_json["message"]
+    async def receive(self, text_data=None, bytes_data=None):
+        try:
+            text_data_json = json.loads(text_data or "")
+        except ValueError:
+            text_data_json = None
+        if not isinstance(text_data_json, dict):
+            await self.send(
+                text_data=json.dumps(
+                    {"type": "error", "error": "Expected a JSON object"}
+                )
+            )
+            return
 
-        # Send message to room group
-        await self.channel_layer.group_send(
-            self.room_group_name, {"type": "results_update", "message": message}
-        )
+        # Clients may ask for the current leaderboard at any time
+        if text_data_json.get("type") == "snapshot":
+            message = await self.get_leaderboard_message()
+            await self.send(text_data=json.dumps(message))
 
     # Receive message from room group
     async def results_update(self, event):
         message = event["message"]
 
         # Send message to WebSocket
-        await self.send(text_data=json.dumps({"message": message}))
+        await self.send(text_data=json.dumps(message))
+
+    @database_sync_to_async
+    def get_leaderboard_message(self):
+        category = Category.objects.filter(slug=self.category_slug).first()
+        if category is None:
+            return None
+        return leaderboard_message(get_category_leaderboard(category.name))
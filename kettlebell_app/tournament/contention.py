@@ -0,0 +1,213 @@
+"""Concurrent scorers and spectators against copies of the SQLite database.
+
+Every worker is a separate process with its own connection, like a
+gunicorn worker. Scorers save attempts the way the admin does; spectators
+render results pages with a cold results cache. Each profile runs against
+a fresh copy of the database, so the real one is only read, and workers use
+a private results cache and channel layer, so neither the live site's cache
+nor its WebSocket clients see the benchmark's saves.
+
+Nothing here imports models at module level: workers are spawned and set
+up Django themselves before touching the database.
+"""
+
+import multiprocessing
+import random
+import sqlite3
+import time
+from contextlib import closing
+from pathlib import Path
+from tempfile import TemporaryDirectory
+
+from .backups import copy_database
+
+ROLES = ["scorer", "spectator"]
+
+# Statements on a tournament-sized database take well under a millisecond;
+# anything slower is counted as waiting for a lock
+LOCK_WAIT_THRESHOLD = 0.01
+
+# Django's SQLite defaults: rollback journal, deferred transactions and a
+# new connection for every request
+BASELINE = {
+    "journal_mode": "DELETE",
+    "pragmas": {},
+    "options": {},
+    "conn_max_age": 0,
+}
+
+PRIVATE_CACHE = "tournament-contention"
+
+
+def worker_settings(profile):
+    """Settings overrides that keep a worker's side effects to itself."""
+    from django.conf import settings
+    from django.test import override_settings
+
+    return override_settings(
+        CACHES={
+            **settings.CACHES,
+            PRIVATE_CACHE: {
+                "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+                "LOCATION": PRIVATE_CACHE,
+            },
+        },
+        TOURNAMENT_RESULTS_CACHE=PRIVATE_CACHE,
+        CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}},
+        TOURNAMENT_SQLITE_PRAGMAS=profile["pragmas"],
+    )
+
+
+def get_profiles(database, pragmas):
+    """The baseline and the profile configured in the settings."""
+    return {
+        "baseline": BASELINE,
+        "configured": {
+            "journal_mode": pragmas.get("journal_mode", "DELETE"),
+            "pragmas": pragmas,
+            "options": database.get("OPTIONS", {}),
+            "conn_max_age": database.get("CONN_MAX_AGE", 0),
+        },
+    }
+
+
+class LockWaits:
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            if elapsed > LOCK_WAIT_THRESHOLD:
+                self.count += 1
+                self.seconds += elapsed
+
+
+def _worker(role, seed, path, profile, seconds, barrier, results):
+    import django
+
+    django.setup()
+
+    from django.db import (
+        DEFAULT_DB_ALIAS,
+        OperationalError,
+        close_old_connections,
+        connections,
+        transaction,
+    )
+    from django.test import RequestFactory
+
+    from . import results_cache, views
+    from .benchmarks import KETTLEBELLS
+    from .models import Category, Player
+
+    worker_settings(profile).enable()
+    connections.settings[DEFAULT_DB_ALIAS].update(
+        NAME=path, OPTIONS=profile["options"], CONN_MAX_AGE=profile["conn_max_age"]
+    )
+
+    rng = random.Random(seed)
+    players = list(Player.objects.values_list("pk", flat=True))
+    categories = [c.slug for c in Category.objects.all() if c.disciplines]
+    request = RequestFactory().get("/")
+    close_old_connections()
+
+    def save_attempt():
+        with transaction.atomic():
+            player = Player.objects.get(pk=rng.choice(players))
+            player.tgu_weight_1 = float(rng.choice(KETTLEBELLS))
+            player.save()
+
+    def view_results():
+        results_cache._cache().clear()
+        views.calculate_category_results(request, rng.choice(categories))
+
+    operation = save_attempt if role == "scorer" else view_results
+    waits = LockWaits()
+    latencies, errors = [], 0
+    barrier.wait()
+    deadline = time.monotonic() + seconds
+    with connections[DEFAULT_DB_ALIAS].execute_wrapper(waits):
+        while time.monotonic() < deadline:
+            # Like request_started/request_finished around every request
+            close_old_connections()
+            start = time.perf_counter()
+            try:
+                operation()
+            except OperationalError:
+                # "database is locked"
+                errors += 1
+            else:
+                latencies.append(time.perf_counter() - start)
+            close_old_connections()
+    connections.close_all()
+    results.put((role, latencies, errors, waits.count, waits.seconds))
+
+
+def _summary(results, seconds):
+    latencies = sorted(latency for result in results for latency in result[1])
+
+    def percentile(share):
+        return latencies[round(share * (len(latencies) - 1))] if latencies else None
+
+    return {
+        "operations": len(latencies),
+        "per_second": len(latencies) / seconds,
+        "median": percentile(0.5),
+        "p95": percentile(0.95),
+        "max": latencies[-1] if latencies else None,
+        "errors": sum(result[2] for result in results),
+        "lock_waits": sum(result[3] for result in results),
+        "lock_wait_seconds": sum(result[4] for result in results),
+    }
+
+
+def run_contention(source, profiles, scorers=4, spectators=8, seconds=10, log=None):
+    """Run every profile on its own copy of ``source``; returns the report.
+
+    The report maps profile names to a summary per role: successful
+    operations per second, latency percentiles in seconds, operations
+    that failed with a database error and statements that waited for a lock.
+    """
+    log = log or (lambda message: None)
+    context = multiprocessing.get_context("spawn")
+    roles = ["scorer"] * scorers + ["spectator"] * spectators
+    report = {}
+    with TemporaryDirectory() as directory:
+        for name, profile in profiles.items():
+            path = Path(directory) / f"{name}.sqlite3"
+            copy_database(source, path, pages=-1, pause=0)
+            with closing(sqlite3.connect(path)) as database:
+                database.execute(f"PRAGMA journal_mode = {profile['journal_mode']}")
+
+            log(f"{name}: {scorers} scorers, {spectators} spectators, {seconds}s")
+            barrier = context.Barrier(len(roles) + 1)
+            queue = context.Queue()
+            processes = [
+                context.Process(
+                    target=_worker,
+                    args=(role, seed, str(path), profile, seconds, barrier, queue),
+                    daemon=True,
+                )
+                for seed, role in enumerate(roles)
+            ]
+            for process in processes:
+                process.start()
+            try:
+                barrier.wait(timeout=120)
+                results = [queue.get(timeout=seconds + 120) for _ in processes]
+            finally:
+                for process in processes:
+                    process.join(timeout=5)
+                    if process.is_alive():
+                        process.terminate()
+
+            report[name] = {
+                role: _summary([r for r in results if r[0] == role], seconds)
+                for role in ROLES
+            }
+    return report
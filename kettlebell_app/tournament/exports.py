@@ -0,0 +1,80 @@
+import csv
+import json
+
+from django.conf import settings
+from django.db.models import F, OuterRef, Subquery
+
+from .models import Category, CategoryResult, Player
+from .resources import PlayerExportResource, prefetch_export_results
+
+EXPORT_FORMATS = {
+    "csv": "text/csv; charset=utf-8",
+    "jsonl": "application/x-ndjson; charset=utf-8",
+}
+
+CATEGORY_HEADER = "Klasyfikacja"
+
+
+def get_export_categories(category_slug=None):
+    """Return the categories to export: one picked by slug, or all of them."""
+    categories = Category.objects.order_by("name")
+    if category_slug is None:
+        return list(categories)
+    return list(categories.filter(slug=category_slug))
+
+
+def get_export_headers():
+    return [CATEGORY_HEADER, *PlayerExportResource().get_export_headers()]
+
+
+def iter_results_rows(categories, chunk_size=None):
+    """Yield one row per athlete and category, ordered by final position.
+
+    Players are read with ``iterator(chunk_size=...)``, so only one chunk
+    (plus its prefetched results) is held in memory at a time.
+    """
+    if chunk_size is None:
+        chunk_size = getattr(settings, "TOURNAMENT_EXPORT_CHUNK_SIZE", 200)
+    for category in categories:
+        resource = PlayerExportResource(category=category)
+        final_position = CategoryResult.objects.filter(
+            player=OuterRef("pk"), category=category
+        ).values("final_position")
+        players = prefetch_export_results(
+            Player.objects.filter(categories=category)
+            .annotate(final_position=Subquery(final_position))
+            .order_by(F("final_position").asc(nulls_last=True), "pk")
+        )
+        for player in players.iterator(chunk_size=chunk_size):
+            yield [category.name, *resource.export_resource(player)]
+
+
+class Echo:
+    """File-like object handing back whatever ``csv.writer`` writes to it."""
+
+    def write(self, value):
+        return value
+
+
+def iter_csv(headers, rows):
+    writer = csv.writer(Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def iter_jsonl(headers, rows):
+    for row in rows:
+        yield json.dumps(dict(zip(headers, row)), ensure_ascii=False, default=str)
+        yield "\n"
+
+
+def iter_export(export_format, categories, chunk_size=None):
+    """Yield the encoded export of ``categories`` piece by piece."""
+    headers = get_export_headers()
+    rows = iter_results_rows(categories, chunk_size=chunk_size)
+    if export_format == "csv":
+        return iter_csv(headers, rows)
+    if export_format == "jsonl":
+        return iter_jsonl(headers, rows)
+    raise ValueError(f"Unknown export format: {export_format}")
@@ -1,11 +1,31 @@
 from django import forms
 
-from .models import Category
+from .models import AVAILABLE_DISCIPLINES, DISCIPLINE_PLAYER_FIELDS, Category, Player
+from .scheduling import ORDER_TIME, START_LIST_ORDERS
 
 
 class StationForm(forms.Form):
-    category = forms.ChoiceField(choices=[], label="Kategoria")
+    # No category schedules the whole field, each athlete once
+    category = forms.ChoiceField(choices=[], required=False, label="Kategoria")
     stations = forms.IntegerField(min_value=1, label="Liczba stanowisk")
+    order = forms.ChoiceField(
+        choices=START_LIST_ORDERS, required=False, label="Kolejność na stanowisku"
+    )
+
+    def clean_order(self):
+        return self.cleaned_data["order"] or ORDER_TIME
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["category"].choices = [("", "Wszystkie kategorie")] + [
+            (category.name, category.name.replace("_", " "))
+            for category in Category.objects.all()
+        ]
+
+
+class ResultsSheetForm(forms.Form):
+    category = forms.ChoiceField(choices=[], label="Kategoria")
+    discipline = forms.ChoiceField(choices=AVAILABLE_DISCIPLINES, label="Konkurencja")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -13,3 +33,15 @@ class StationForm(forms.Form):
             (category.name, category.name.replace("_", " "))
             for category in Category.objects.all()
         ]
+
+
+def get_attempt_fields(discipline):
+    return [
+        field for field in DISCIPLINE_PLAYER_FIELDS[discipline] if field != "weight"
+    ]
+
+
+def results_sheet_formset(discipline):
+    return forms.modelformset_factory(
+        Player, fields=get_attempt_fields(discipline), extra=0
+    )
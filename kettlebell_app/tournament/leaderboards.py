@@ -0,0 +1,228 @@
+import logging
+
+from django.db import transaction
+
+from .models import (
+    DISCIPLINE_POSITION_FIELDS,
+    Category,
+    CategoryLeaderboard,
+    CategoryResult,
+)
+
+logger = logging.getLogger(__name__)
+
+
+def _pair_attempts(attempts):
+    return {
+        f"attempt_{number}": f"{left:.1f}/{right:.1f}"
+        for number, (left, right) in enumerate(attempts, start=1)
+    }
+
+
+DISCIPLINE_CONFIGS = {
+    "snatch": {
+        "calculate": lambda player, result: {
+            "max_result": result.snatch_result or 0,
+            "kettlebell_weight": player.snatch_kettlebell_weight,
+            "repetitions": player.snatch_repetitions,
+        },
+    },
+    "tgu": {
+        "calculate": lambda player, result: {
+            "max_result": result.tgu_result or 0,
+            "bw_percentage": round(player.tgu_body_percent or 0, 2),
+            "attempt_1": float(player.tgu_weight_1 or 0),
+            "attempt_2": float(player.tgu_weight_2 or 0),
+            "attempt_3": float(player.tgu_weight_3 or 0),
+        },
+    },
+    "see_saw_press": {
+        "calculate": lambda player, result: {
+            "max_result": result.see_saw_press_result or 0,
+            "bw_percentage": round(player.see_saw_press_body_percent or 0, 1),
+            **_pair_attempts(player.get_see_saw_press_attempts()),
+        },
+    },
+    "kb_squat": {
+        "calculate": lambda player, result: {
+            "max_result": result.kb_squat_result or 0,
+            "bw_percentage": round(player.kb_squat_body_percent or 0, 1),
+            **_pair_attempts(player.get_kb_squat_attempts()),
+        },
+    },
+    "pistol_squat": {
+        "calculate": lambda player, result: {
+            "max_result": result.pistol_squat_result or 0,
+            "bw_percentage": round(player.pistol_squat_body_percent or 0, 2),
+            "attempt_1": float(player.pistol_squat_weight_1 or 0),
+            "attempt_2": float(player.pistol_squat_weight_2 or 0),
+            "attempt_3": float(player.pistol_squat_weight_3 or 0),
+        },
+    },
+}
+
+
+def _player_data(player):
+    return {
+        "id": player.pk,
+        "name": player.name,
+        "surname": player.surname,
+        "tiebreak": player.tiebreak,
+        "club": {"name": player.club.name},
+    }
+
+
+def build_leaderboard_data(category):
+    """Compute the ranked, JSON-serializable results of a category.
+
+    Positions come from the category's ``CategoryResult`` rows, which the
+    ranking engine keeps up to date, so this is a single query. The returned
+    dict is the context of the category results templates.
+    """
+    disciplines = category.get_disciplines()
+
+    category_results = (
+        CategoryResult.objects.filter(category=category)
+        .select_related("player__club")
+        .order_by("final_position", "player_id")
+    )
+
+    results = {discipline: [] for discipline in disciplines}
+    overall_results = []
+
+    for category_result in category_results:
+        player = category_result.player
+        player_data = _player_data(player)
+        player_results = {"player": player_data, "weight": player.weight}
+        ranked = False
+
+        for discipline in disciplines:
+            config = DISCIPLINE_CONFIGS.get(discipline)
+            if not config:
+                player_results[f"{discipline}_place"] = 0
+                continue
+            position = getattr(category_result, DISCIPLINE_POSITION_FIELDS[discipline])
+            try:
+                discipline_result = {
+                    "player": player_data,
+                    "weight": player.weight,
+                    **config["calculate"](player, category_result),
+                    "position": position,
+                }
+            except Exception:
+                logger.exception(
+                    f"Error calculating results for {player} in {discipline}"
+                )
+                player_results[f"{discipline}_place"] = 0
+                continue
+            results[discipline].append(discipline_result)
+            player_results[f"{discipline}_place"] = position
+            ranked = True
+
+        if ranked:
+            player_results["total_points"] = category_result.total_points
+        total_points = player_results.get("total_points", 0)
+        player_results["final_score"] = (
+            total_points - 0.5 if player.tiebreak else total_points
+        )
+        player_results["total_place"] = category_result.final_position
+        player_results["final_place"] = category_result.final_position
+        overall_results.append(player_results)
+
+    for discipline in disciplines:
+        results[discipline].sort(key=lambda x: (x["position"], x["player"]["id"]))
+
+    return {
+        "category_slug": category.slug,
+        "overall_results": overall_results,
+        "disciplines": disciplines,
+        "snatch_results": results.get("snatch", []),
+        "tgu_results": results.get("tgu", []),
+        "see_saw_results": results.get("see_saw_press", []),
+        "kb_squat_results": results.get("kb_squat", []),
+        "pistol_squat_results": results.get("pistol_squat", []),
+    }
+
+
+def _diff_rows(old_rows, new_rows):
+    old_by_player = {row["player"]["id"]: row for row in old_rows}
+    change = {}
+
+    order = [row["player"]["id"] for row in new_rows]
+    if order != [row["player"]["id"] for row in old_rows]:
+        change["order"] = order
+
+    rows, updates = {}, {}
+    for row in new_rows:
+        player_id = row["player"]["id"]
+        previous = old_by_player.get(player_id)
+        if previous is None or previous.keys() - row.keys():
+            rows[player_id] = row
+            continue
+        fields = {
+            key: value
+            for key, value in row.items()
+            if key not in previous or previous[key] != value
+        }
+        if fields:
+            updates[player_id] = fields
+    if rows:
+        change["rows"] = rows
+    if updates:
+        change["update"] = updates
+    return change
+
+
+def diff_leaderboard_data(old, new):
+    """Return a patch turning leaderboard data ``old`` into ``new``.
+
+    Result lists are diffed row by row, keyed by player id: ``order`` lists
+    the player ids when the rows were reordered, added or removed, ``rows``
+    holds complete new rows and ``update`` only the changed fields of the
+    others. Any other changed key is replaced as a whole in ``set``. Returns
+    None when nothing changed.
+    """
+    if old == new:
+        return None
+    patch = {"set": {}, "lists": {}}
+    for key, value in new.items():
+        if key.endswith("_results"):
+            change = _diff_rows(old.get(key, []), value)
+            if change:
+                patch["lists"][key] = change
+        elif key not in old or old[key] != value:
+            patch["set"][key] = value
+    return patch
+
+
+def rebuild_category_leaderboard(category):
+    """Store a fresh leaderboard snapshot of the category and bump its version.
+
+    The diff against the previous snapshot is left in ``leaderboard.patch``;
+    it is None, and the version is not bumped, when nothing changed. The
+    data is read while holding the leaderboard's row lock, so concurrent
+    rebuilds store their snapshots in version order.
+    """
+    with transaction.atomic():
+        leaderboard, _ = CategoryLeaderboard.objects.select_for_update().get_or_create(
+            category=category
+        )
+        data = build_leaderboard_data(category)
+        leaderboard.patch = diff_leaderboard_data(leaderboard.data, data)
+        if leaderboard.patch is not None:
+            leaderboard.data = data
+            leaderboard.version += 1
+            leaderboard.save()
+    return leaderboard
+
+
+def get_category_leaderboard(category_name):
+    """Return the stored leaderboard of a category, building it if missing."""
+    leaderboard = CategoryLeaderboard.objects.filter(
+        category__name=category_name
+    ).first()
+    if leaderboard is None:
+        leaderboard = rebuild_category_leaderboard(
+            Category.objects.get(name=category_name)
+        )
+    return leaderboard
@@ -0,0 +1,75 @@
+import logging
+import sqlite3
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.backups import backup_database, get_database_path, rotate_backups
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Back up the SQLite database into DBBACKUP_PATH with the online backup "
+        "API, every --interval seconds, rotating old backups."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=getattr(settings, "TOURNAMENT_BACKUP_INTERVAL", 60),
+            help="Seconds between backups.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Take a single backup and exit.",
+        )
+        parser.add_argument(
+            "--database",
+            default="default",
+            help="Database alias to back up.",
+        )
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        try:
+            get_database_path(alias)
+        except ValueError as e:
+            raise CommandError(e)
+
+        if options["once"]:
+            try:
+                self._backup(alias)
+            except (OSError, sqlite3.Error) as e:
+                raise CommandError(f"Backup failed: {e}")
+            return
+
+        self.stdout.write(
+            f"Backing up every {options['interval']:g}s (Ctrl+C to stop)..."
+        )
+        try:
+            while True:
+                start = time.monotonic()
+                try:
+                    self._backup(alias)
+                except Exception:
+                    # Keep the schedule; the failure shows up in /metrics/
+                    logger.exception("Database backup failed")
+                time.sleep(max(0, options["interval"] - (time.monotonic() - start)))
+        except KeyboardInterrupt:
+            pass
+
+    def _backup(self, alias):
+        status = backup_database(alias)
+        deleted = rotate_backups(alias)
+        logger.info(
+            "Backed up the database to %s in %.3fs, removed %d old backups",
+            status["path"],
+            status["seconds"],
+            len(deleted),
+        )
+        self.stdout.write(f"Backup: {status['path']} ({status['seconds']:.3f}s)")
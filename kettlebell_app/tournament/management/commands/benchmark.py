@@ -0,0 +1,94 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.benchmarks import (
+    BENCHMARKS,
+    DEFAULT_SIZES,
+    compare_reports,
+    load_profile,
+    run_benchmarks,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark saving, ranking, results pages, start lists, import and export "
+        "on synthetic tournaments shaped like fixtures/dump.yaml. "
+        "Everything runs in transactions that are rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--sizes",
+            type=int,
+            nargs="+",
+            default=DEFAULT_SIZES,
+            help="Numbers of athletes of the generated tournaments.",
+        )
+        parser.add_argument(
+            "--rounds", type=int, default=3, help="Runs of every benchmark."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--only",
+            nargs="+",
+            choices=list(BENCHMARKS),
+            help="Run only these benchmarks.",
+        )
+        parser.add_argument(
+            "--fixture",
+            help="Fixture the tournaments are shaped after "
+            "(default: fixtures/dump.yaml).",
+        )
+        parser.add_argument(
+            "--output", help="Write the JSON report (pytest-benchmark layout) here."
+        )
+        parser.add_argument(
+            "--compare",
+            help="Fail if the results regressed against this earlier report.",
+        )
+        parser.add_argument(
+            "--threshold",
+            type=float,
+            default=0.25,
+            help="Allowed relative growth of the median time with --compare.",
+        )
+
+    def handle(self, *args, **options):
+        report = run_benchmarks(
+            sizes=options["sizes"],
+            rounds=options["rounds"],
+            seed=options["seed"],
+            profile=load_profile(options["fixture"]),
+            names=options["only"],
+            log=self.stderr.write,
+        )
+        self._write_table(report)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Zapisano raport: {options['output']}")
+
+        if options["compare"]:
+            with open(options["compare"], encoding="utf-8") as baseline:
+                regressions = compare_reports(
+                    json.load(baseline), report, options["threshold"]
+                )
+            if regressions:
+                raise CommandError("Wykryto regresje:\n" + "\n".join(regressions))
+            self.stdout.write("Brak regresji względem raportu bazowego")
+
+    def _write_table(self, report):
+        self.stdout.write(
+            f"{'benchmark':<40}{'mediana':>12}{'min':>12}{'zapytania':>11}"
+        )
+        for bench in report["benchmarks"]:
+            stats = bench["stats"]
+            self.stdout.write(
+                f"{bench['name']:<40}"
+                f"{stats['median'] * 1000:>9.1f} ms"
+                f"{stats['min'] * 1000:>9.1f} ms"
+                f"{bench['extra_info']['queries']:>11}"
+            )
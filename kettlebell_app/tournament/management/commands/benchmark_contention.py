@@ -0,0 +1,85 @@
+import json
+import sqlite3
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+
+from tournament.backups import get_database_path
+from tournament.contention import get_profiles, run_contention
+from tournament.models import Player
+
+
+class Command(BaseCommand):
+    help = (
+        "Simulate scorers saving attempts while spectators load results pages, "
+        "on copies of the SQLite database, with SQLite's defaults and with the "
+        "configured pragmas and connection options."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scorers", type=int, default=4, help="Processes saving attempts."
+        )
+        parser.add_argument(
+            "--spectators", type=int, default=8, help="Processes loading results."
+        )
+        parser.add_argument(
+            "--seconds", type=float, default=10, help="Duration of each profile."
+        )
+        parser.add_argument(
+            "--database", default="default", help="Database alias to copy."
+        )
+        parser.add_argument("--output", help="Write the JSON report here.")
+
+    def handle(self, *args, **options):
+        alias = options["database"]
+        try:
+            source = get_database_path(alias)
+        except ValueError as e:
+            raise CommandError(e)
+        if not Player.objects.using(alias).exists():
+            raise CommandError("The database has no players to score")
+
+        profiles = get_profiles(
+            connections[alias].settings_dict,
+            getattr(settings, "TOURNAMENT_SQLITE_PRAGMAS", {}),
+        )
+        try:
+            report = run_contention(
+                source,
+                profiles,
+                scorers=options["scorers"],
+                spectators=options["spectators"],
+                seconds=options["seconds"],
+                log=self.stderr.write,
+            )
+        except (OSError, sqlite3.Error) as e:
+            raise CommandError(f"Benchmark failed: {e}")
+        self._write_table(report)
+
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8") as output:
+                json.dump(report, output, indent=2)
+            self.stdout.write(f"Zapisano raport: {options['output']}")
+
+    def _write_table(self, report):
+        self.stdout.write(
+            f"{'profil':<12}{'rola':<11}{'operacje/s':>11}{'mediana':>12}"
+            f"{'p95':>12}{'max':>12}{'oczekiwania':>13}{'błędy':>7}"
+        )
+        for name, roles in report.items():
+            for role, stats in roles.items():
+                times = "".join(
+                    _format_time(stats[key]) for key in ("median", "p95", "max")
+                )
+                self.stdout.write(
+                    f"{name:<12}{role:<11}{stats['per_second']:>11.1f}{times}"
+                    f"{stats['lock_waits']:>13}{stats['errors']:>7}"
+                )
+
+
+def _format_time(seconds):
+    if seconds is None:
+        return f"{'-':>12}"
+    return f"{seconds * 1000:>9.1f} ms"
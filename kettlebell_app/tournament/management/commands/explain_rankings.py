@@ -0,0 +1,127 @@
+import json
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+
+from tournament.benchmarks import generate_tournament
+from tournament.leaderboards import build_leaderboard_data
+from tournament.models import (
+    CategoryResult,
+    discipline_ranking_query,
+    update_overall_results,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Explain and time the ranking queries on a synthetic tournament, "
+        "with and without the CategoryResult ranking indexes. "
+        "Everything runs in a transaction that is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--players", type=int, default=5000)
+        parser.add_argument("--categories", type=int, default=12)
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="How many times every query is run when timing it.",
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--json", action="store_true", help="Print the report as JSON."
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            categories = generate_tournament(
+                players=options["players"],
+                categories=options["categories"],
+                seed=options["seed"],
+            )
+            category = max(categories, key=lambda c: c.results.count())
+            report = {
+                "players": options["players"],
+                "category_players": category.results.count(),
+            }
+            report["with_indexes"] = self._measure(
+                category, options["repeat"], "with_indexes"
+            )
+            self._drop_ranking_indexes()
+            report["without_indexes"] = self._measure(
+                category, options["repeat"], "without_indexes"
+            )
+            transaction.set_rollback(True)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self._write_report(report)
+
+    def _queries(self, category):
+        queries = {
+            discipline: discipline_ranking_query(category, discipline)
+            for discipline in category.disciplines
+        }
+        queries["leaderboard"] = CategoryResult.objects.filter(
+            category=category
+        ).order_by("final_position", "player_id")
+        return queries
+
+    def _explain(self, queryset, label):
+        # The label keeps the SQL text unique per phase: a cached EXPLAIN
+        # statement would keep reporting the plan from before DROP INDEX.
+        sql, params = queryset.query.sql_with_params()
+        prefix = connection.ops.explain_query_prefix()
+        with connection.cursor() as cursor:
+            cursor.execute(f"{prefix} {sql} /* {label} */", params)
+            return "\n".join(
+                " ".join(str(column) for column in row) for row in cursor.fetchall()
+            )
+
+    def _measure(self, category, repeat, label):
+        measurements = {}
+        for name, queryset in self._queries(category).items():
+            start = time.perf_counter()
+            for _ in range(repeat):
+                list(queryset.all())
+            measurements[name] = {
+                "ms": round((time.perf_counter() - start) * 1000 / repeat, 3),
+                "plan": self._explain(queryset, label),
+            }
+        for name, func in (
+            ("update_overall_results", update_overall_results),
+            ("build_leaderboard_data", build_leaderboard_data),
+        ):
+            start = time.perf_counter()
+            func(category)
+            measurements[name] = {
+                "ms": round((time.perf_counter() - start) * 1000, 3),
+                "plan": None,
+            }
+        return measurements
+
+    def _drop_ranking_indexes(self):
+        with connection.cursor() as cursor:
+            for index in CategoryResult._meta.indexes:
+                cursor.execute(f"DROP INDEX {connection.ops.quote_name(index.name)}")
+
+    def _write_report(self, report):
+        self.stdout.write(
+            f"{report['players']} zawodników, "
+            f"w mierzonej kategorii: {report['category_players']}"
+        )
+        self.stdout.write(f"{'zapytanie':<24}{'z indeksami':>14}{'bez indeksów':>14}")
+        for name, measured in report["with_indexes"].items():
+            without = report["without_indexes"][name]
+            self.stdout.write(
+                f"{name:<24}{measured['ms']:>11.3f} ms{without['ms']:>11.3f} ms"
+            )
+        for label in ("with_indexes", "without_indexes"):
+            self.stdout.write(f"\nPlany ({label}):")
+            for name, measured in report[label].items():
+                if measured["plan"]:
+                    plan = measured["plan"].replace("\n", "\n  ")
+                    self.stdout.write(f"{name}:\n  {plan}")
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.exports import EXPORT_FORMATS, get_export_categories, iter_export
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream final results as CSV or JSON lines, for one category or as a "
+        "full results book of all categories."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--format",
+            choices=sorted(EXPORT_FORMATS),
+            default="csv",
+        )
+        parser.add_argument(
+            "--category",
+            help="Slug of the category to export (default: all categories).",
+        )
+        parser.add_argument(
+            "--output",
+            help="File to write to (default: stdout).",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            help="Players read from the database at a time.",
+        )
+
+    def handle(self, *args, **options):
+        categories = get_export_categories(options["category"])
+        if not categories:
+            raise CommandError(f"Unknown category: {options['category']}")
+
+        chunks = iter_export(
+            options["format"], categories, chunk_size=options["chunk_size"]
+        )
+        if options["output"]:
+            with open(options["output"], "w", encoding="utf-8", newline="") as f:
+                f.writelines(chunks)
+        else:
+            for chunk in chunks:
+                self.stdout.write(chunk, ending="")
@@ -0,0 +1,77 @@
+import logging
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from tournament.models import (
+    Category,
+    recompute_dirty_rankings,
+    update_overall_results,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute rankings of categories marked dirty by Player saves "
+        "(used together with TOURNAMENT_DEFER_RANKINGS = True)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--window",
+            type=float,
+            default=getattr(settings, "TOURNAMENT_RANKINGS_WINDOW", 2.0),
+            help="Seconds a category stays dirty before it is recomputed, "
+            "coalescing saves made in the meantime.",
+        )
+        parser.add_argument(
+            "--interval",
+            type=float,
+            default=0.5,
+            help="Seconds between polls for dirty categories.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Recompute all dirty categories once and exit.",
+        )
+        parser.add_argument(
+            "--all",
+            action="store_true",
+            help="Recompute every category once and exit "
+            "(e.g. after loading fixtures).",
+        )
+
+    def handle(self, *args, **options):
+        if options["all"]:
+            for category in Category.objects.all():
+                update_overall_results(category)
+            self.stdout.write("Recomputed rankings of all categories")
+            return
+
+        if options["once"]:
+            self._recompute(window=0)
+            return
+
+        self.stdout.write("Waiting for dirty categories (Ctrl+C to stop)...")
+        try:
+            while True:
+                self._recompute(window=options["window"])
+                time.sleep(options["interval"])
+        except KeyboardInterrupt:
+            pass
+
+    def _recompute(self, window):
+        start = time.perf_counter()
+        categories = recompute_dirty_rankings(window=window)
+        if categories:
+            names = ", ".join(category.name for category in categories)
+            logger.info(
+                "Recomputed rankings for %s in %.3fs",
+                names,
+                time.perf_counter() - start,
+            )
+            self.stdout.write(f"Recomputed rankings: {names}")
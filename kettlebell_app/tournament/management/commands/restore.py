@@ -0,0 +1,42 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tournament.snapshots import restore_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Replace the tournament with a snapshot written by `manage.py snapshot` "
+        "and recompute all rankings once."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot file to read.")
+        parser.add_argument(
+            "--no-input",
+            "--noinput",
+            action="store_false",
+            dest="interactive",
+            help="Do not ask for confirmation.",
+        )
+
+    def handle(self, *args, **options):
+        if options["interactive"]:
+            confirm = input(
+                "This will replace all clubs, categories, players and results "
+                "in the database.\nType 'yes' to continue, or 'no' to cancel: "
+            )
+            if confirm != "yes":
+                self.stdout.write("Restore cancelled.")
+                return
+
+        start = time.perf_counter()
+        try:
+            counts = restore_snapshot(options["path"])
+        except (OSError, ValueError) as e:
+            raise CommandError(e)
+        self.stdout.write(
+            f"Restored {sum(counts.values())} rows from {options['path']} "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
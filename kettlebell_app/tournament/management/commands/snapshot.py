@@ -0,0 +1,23 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from tournament.snapshots import write_snapshot
+
+
+class Command(BaseCommand):
+    help = (
+        "Save the tournament to a compact JSON lines snapshot "
+        "(gzip-compressed when the file name ends in .gz)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="Snapshot file to write.")
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        counts = write_snapshot(options["path"])
+        self.stdout.write(
+            f"Saved {sum(counts.values())} rows to {options['path']} "
+            f"in {time.perf_counter() - start:.3f}s"
+        )
@@ -0,0 +1,331 @@
+"""Per-view request instrumentation exposed in the Prometheus text format.
+
+``MetricsMiddleware`` times every request and counts its SQL queries; the
+``InstrumentedDjangoTemplates`` backend adds template render time. Category
+pages share one view, so they are also labelled with the category slug. Numbers
+are kept in histograms of the current process, so every worker serves its
+own at ``/metrics/``. Streaming responses are measured until the response
+object is returned, not until the last chunk is sent.
+"""
+
+import cProfile
+import heapq
+import hmac
+import os
+import random
+import threading
+import time
+from contextlib import ExitStack
+from contextvars import ContextVar
+from pathlib import Path
+
+from django.conf import settings
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+from . import backups, results_cache
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+SECONDS_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+_lock = threading.Lock()
+_current = ContextVar("tournament_request_stats", default=None)
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(names, values):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.values = {}
+
+    def inc(self, *labels, amount=1):
+        with _lock:
+            self.values[labels] = self.values.get(labels, 0) + amount
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} counter"
+        with _lock:
+            values = sorted(self.values.items())
+        for labels, value in values:
+            yield f"{self.name}{_labels(self.labelnames, labels)} {value}"
+
+
+class Histogram:
+    def __init__(self, name, documentation, buckets, labelnames=("view", "category")):
+        self.name = name
+        self.documentation = documentation
+        self.buckets = buckets
+        self.labelnames = labelnames
+        self.series = {}  # labels -> [count per bucket..., sum, count]
+
+    def observe(self, value, *labels):
+        with _lock:
+            series = self.series.setdefault(labels, [0] * len(self.buckets) + [0, 0])
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    series[i] += 1
+            series[-2] += value
+            series[-1] += 1
+
+    def expose(self):
+        yield f"# HELP {self.name} {self.documentation}"
+        yield f"# TYPE {self.name} histogram"
+        with _lock:
+            series = sorted(
+                (labels, list(values)) for labels, values in self.series.items()
+            )
+        bucket_names = (*self.labelnames, "le")
+        for labels, values in series:
+            for bound, count in zip(self.buckets, values):
+                bucket_labels = _labels(bucket_names, (*labels, bound))
+                yield f"{self.name}_bucket{bucket_labels} {count}"
+            inf_labels = _labels(bucket_names, (*labels, "+Inf"))
+            yield f"{self.name}_bucket{inf_labels} {values[-1]}"
+            yield f"{self.name}_sum{_labels(self.labelnames, labels)} {values[-2]}"
+            yield f"{self.name}_count{_labels(self.labelnames, labels)} {values[-1]}"
+
+
+REQUESTS = Counter(
+    "tournament_requests_total",
+    "Requests served, by view, category, method and status code.",
+    ("view", "category", "method", "status"),
+)
+REQUEST_SECONDS = Histogram(
+    "tournament_request_duration_seconds",
+    "Total time spent producing the response.",
+    SECONDS_BUCKETS,
+)
+DB_SECONDS = Histogram(
+    "tournament_request_db_seconds",
+    "Time spent executing SQL queries per request.",
+    SECONDS_BUCKETS,
+)
+TEMPLATE_SECONDS = Histogram(
+    "tournament_request_template_seconds",
+    "Time spent rendering templates per request.",
+    SECONDS_BUCKETS,
+)
+QUERIES = Histogram(
+    "tournament_request_queries",
+    "SQL queries executed per request.",
+    QUERY_BUCKETS,
+)
+METRICS = [REQUESTS, REQUEST_SECONDS, DB_SECONDS, TEMPLATE_SECONDS, QUERIES]
+
+
+def render():
+    """All metrics of this process in the Prometheus text format."""
+    lines = []
+    for metric in METRICS:
+        lines.extend(metric.expose())
+    lines.extend(_results_cache_lines())
+    lines.extend(_backup_lines())
+    return "\n".join(lines) + "\n"
+
+
+def _results_cache_lines():
+    name = "tournament_results_cache_events_total"
+    yield f"# HELP {name} Results cache hits, misses and invalidations."
+    yield f"# TYPE {name} counter"
+    for event, count in sorted(results_cache.get_stats().items()):
+        yield f"{name}{_labels(('event',), (event,))} {count}"
+
+
+def _backup_lines():
+    if not getattr(settings, "DBBACKUP_PATH", None):
+        return
+    status = backups.read_backup_status() or {}
+    finished_at = status.get("finished_at")
+    gauges = [
+        (
+            "last_success_timestamp_seconds",
+            "When the last backup finished.",
+            finished_at,
+        ),
+        (
+            "age_seconds",
+            "Seconds since the last backup finished.",
+            time.time() - finished_at if finished_at else None,
+        ),
+        ("duration_seconds", "Time the last backup took.", status.get("seconds")),
+        ("size_bytes", "Size of the last backup.", status.get("size")),
+        (
+            "failures",
+            "Backups failed since the last successful one.",
+            status.get("failures"),
+        ),
+    ]
+    for suffix, documentation, value in gauges:
+        if value is None:
+            continue
+        name = f"tournament_backup_{suffix}"
+        yield f"# HELP {name} {documentation}"
+        yield f"# TYPE {name} gauge"
+        yield f"{name} {value}"
+
+
+def is_authorized(request):
+    """Staff users, or requests bearing ``TOURNAMENT_METRICS_TOKEN``."""
+    if request.user.is_active and request.user.is_staff:
+        return True
+    token = getattr(settings, "TOURNAMENT_METRICS_TOKEN", None)
+    header = request.headers.get("Authorization", "")
+    return bool(token) and hmac.compare_digest(header, f"Bearer {token}")
+
+
+class RequestStats:
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.template_seconds = 0.0
+        self.template_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - start
+            self.queries += 1
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """``DjangoTemplates`` that reports render time to ``MetricsMiddleware``."""
+
+    def from_string(self, template_code):
+        return TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return TimedTemplate(super().get_template(template_name))
+
+
+class TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        stats = _current.get()
+        if stats is None:
+            return self.template.render(context, request)
+        # Templates rendered while rendering another one are already timed
+        stats.template_depth += 1
+        start = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            stats.template_depth -= 1
+            if not stats.template_depth:
+                stats.template_seconds += time.perf_counter() - start
+
+
+class SlowestProfiles:
+    """Keeps the cProfile dumps of the slowest sampled requests on disk."""
+
+    def __init__(self):
+        self.kept = []  # heap of (seconds, path)
+        self.lock = threading.Lock()
+
+    def keep(self, profile, seconds, view_name, category=""):
+        directory = Path(settings.TOURNAMENT_PROFILE_DIR)
+        limit = getattr(settings, "TOURNAMENT_PROFILE_KEEP", 20)
+        name = view_name.replace(":", "-").replace("/", "-")
+        if category:
+            name = f"{name}-{category}"
+        path = (
+            directory
+            / f"{seconds * 1000:.0f}ms-{name}-{os.getpid()}-{time.time_ns()}.prof"
+        )
+        # Only the heap is guarded; files are written and removed outside the
+        # lock so a slow disk doesn't hold up other requests
+        with self.lock:
+            if len(self.kept) >= limit and seconds <= self.kept[0][0]:
+                return
+            heapq.heappush(self.kept, (seconds, path))
+            dropped = [
+                heapq.heappop(self.kept)[1] for _ in range(len(self.kept) - limit)
+            ]
+
+        directory.mkdir(parents=True, exist_ok=True)
+        profile.dump_stats(path)
+        with self.lock:
+            # Pushed out by slower requests while it was being written
+            if not any(kept == path for _, kept in self.kept):
+                dropped.append(path)
+        for dropped_path in dropped:
+            dropped_path.unlink(missing_ok=True)
+
+
+slowest_profiles = SlowestProfiles()
+
+
+class MetricsMiddleware:
+    """Records latency, SQL queries, DB and template time of every request."""
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        stats = RequestStats()
+        token = _current.set(stats)
+        profile = self._start_profile()
+        start = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for alias in connections:
+                    stack.enter_context(connections[alias].execute_wrapper(stats))
+                response = self.get_response(request)
+        finally:
+            seconds = time.perf_counter() - start
+            if profile is not None:
+                profile.disable()
+            _current.reset(token)
+
+        view_name = self._view_name(request)
+        category = self._category(request, response)
+        REQUESTS.inc(view_name, category, request.method, response.status_code)
+        REQUEST_SECONDS.observe(seconds, view_name, category)
+        DB_SECONDS.observe(stats.db_seconds, view_name, category)
+        TEMPLATE_SECONDS.observe(stats.template_seconds, view_name, category)
+        QUERIES.observe(stats.queries, view_name, category)
+        if profile is not None:
+            slowest_profiles.keep(profile, seconds, view_name, category)
+        return response
+
+    def _start_profile(self):
+        rate = getattr(settings, "TOURNAMENT_PROFILE_SAMPLE_RATE", 0)
+        if not rate or random.random() >= rate:
+            return None
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            # Another profiler is already active in this thread
+            return None
+        return profile
+
+    def _view_name(self, request):
+        match = getattr(request, "resolver_match", None)
+        return match.view_name if match is not None else "unresolved"
+
+    def _category(self, request, response):
+        # Only slugs of existing categories, so unknown URLs can't add series
+        match = getattr(request, "resolver_match", None)
+        if match is None or response.status_code >= 400:
+            return ""
+        return match.kwargs.get("category_slug", "")
@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 06:37
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="rankings_dirty_since",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-18 06:39
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0002_category_rankings_dirty_since"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryLeaderboard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("version", models.PositiveIntegerField(default=0)),
+                ("data", models.JSONField(default=dict)),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "category",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="leaderboard",
+                        to="tournament.category",
+                    ),
+                ),
+            ],
+        ),
+    ]
@@ -0,0 +1,194 @@
+# Generated by Django 5.1 on 2026-10-18 06:54
+
+from collections import defaultdict
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+RESULT_FIELDS = {
+    "snatch": "snatch_result",
+    "tgu": "tgu_result",
+    "see_saw_press": "see_saw_press_result",
+    "kb_squat": "kb_squat_result",
+    "pistol_squat": "pistol_squat_result",
+}
+
+
+def _rank(values):
+    positions = {}
+    previous = None
+    for index, (key, value) in enumerate(values, start=1):
+        if value != previous:
+            position = index
+        positions[key] = position
+        previous = value
+    return positions
+
+
+def _best_pair(result):
+    return max(
+        (left + right if left > 0 and right > 0 else 0)
+        for left, right in [
+            (result.result_left_1, result.result_right_1),
+            (result.result_left_2, result.result_right_2),
+            (result.result_left_3, result.result_right_3),
+        ]
+    )
+
+
+def populate_category_results(apps, schema_editor):
+    """Build one CategoryResult per (player, category) from the old tables."""
+    Category = apps.get_model("tournament", "Category")
+    Player = apps.get_model("tournament", "Player")
+    CategoryResult = apps.get_model("tournament", "CategoryResult")
+
+    maxima = defaultdict(dict)
+    extractors = [
+        ("SnatchResult", "snatch_result", lambda r: r.result or 0),
+        ("TGUResult", "tgu_result", lambda r: max(r.result_1, r.result_2, r.result_3)),
+        ("SeeSawPressResult", "see_saw_press_result", _best_pair),
+        ("KBSquatResult", "kb_squat_result", _best_pair),
+        (
+            "PistolSquatResult",
+            "pistol_squat_result",
+            lambda r: max(r.result_1, r.result_2, r.result_3),
+        ),
+    ]
+    for model_name, field, extract in extractors:
+        model = apps.get_model("tournament", model_name)
+        # The old code always read the first row of a player
+        for result in model.objects.order_by("pk"):
+            maxima[result.player_id].setdefault(field, extract(result))
+
+    tiebreaks = dict(Player.objects.values_list("pk", "tiebreak"))
+    members = defaultdict(list)
+    for player_id, category_id in Player.categories.through.objects.values_list(
+        "player_id", "category_id"
+    ):
+        members[category_id].append(player_id)
+
+    category_results = []
+    for category in Category.objects.all():
+        rows = [
+            CategoryResult(
+                player_id=player_id,
+                category=category,
+                **{
+                    field: maxima[player_id].get(field, 0)
+                    for field in RESULT_FIELDS.values()
+                },
+            )
+            for player_id in sorted(members[category.pk])
+        ]
+        for discipline in category.disciplines:
+            field = RESULT_FIELDS.get(discipline)
+            if field is None:
+                continue
+            ordered = sorted(rows, key=lambda row: -getattr(row, field))
+            positions = _rank((row.player_id, getattr(row, field)) for row in ordered)
+            for row in rows:
+                setattr(row, f"{discipline}_position", positions[row.player_id])
+                row.total_points += positions[row.player_id]
+        for row in rows:
+            row.final_score = row.total_points - (
+                0.5 if tiebreaks[row.player_id] else 0
+            )
+        ordered = sorted(rows, key=lambda row: row.final_score)
+        positions = _rank((row.player_id, row.final_score) for row in ordered)
+        for row in rows:
+            row.final_position = positions[row.player_id]
+        category_results.extend(rows)
+    CategoryResult.objects.bulk_create(category_results)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0003_categoryleaderboard"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="CategoryResult",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("snatch_result", models.FloatField(default=0)),
+                ("tgu_result", models.FloatField(default=0)),
+                ("see_saw_press_result", models.FloatField(default=0)),
+                ("kb_squat_result", models.FloatField(default=0)),
+                ("pistol_squat_result", models.FloatField(default=0)),
+                ("snatch_position", models.IntegerField(blank=True, null=True)),
+                ("tgu_position", models.IntegerField(blank=True, null=True)),
+                ("see_saw_press_position", models.IntegerField(blank=True, null=True)),
+                ("kb_squat_position", models.IntegerField(blank=True, null=True)),
+                ("pistol_squat_position", models.IntegerField(blank=True, null=True)),
+                ("total_points", models.IntegerField(default=0)),
+                ("final_score", models.FloatField(default=0)),
+                ("final_position", models.IntegerField(blank=True, null=True)),
+                (
+                    "category",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="results",
+                        to="tournament.category",
+                    ),
+                ),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="category_results",
+                        to="tournament.player",
+                    ),
+                ),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "final_position"],
+                name="tournament__categor_2e0e35_idx",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="categoryresult",
+            constraint=models.UniqueConstraint(
+                fields=("player", "category"), name="unique_player_category_result"
+            ),
+        ),
+        # Only the forward direction carries data over; rolling back
+        # recreates the old tables empty.
+        migrations.RunPython(populate_category_results, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name="BestKBSquatResult",
+        ),
+        migrations.DeleteModel(
+            name="BestSeeSawPressResult",
+        ),
+        migrations.DeleteModel(
+            name="KBSquatResult",
+        ),
+        migrations.DeleteModel(
+            name="OverallResult",
+        ),
+        migrations.DeleteModel(
+            name="PistolSquatResult",
+        ),
+        migrations.DeleteModel(
+            name="SeeSawPressResult",
+        ),
+        migrations.DeleteModel(
+            name="SnatchResult",
+        ),
+        migrations.DeleteModel(
+            name="TGUResult",
+        ),
+    ]
@@ -0,0 +1,48 @@
+# Generated by Django 5.1 on 2026-10-18 06:59
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0004_categoryresult"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "-snatch_result"],
+                name="tournament__categor_cf3295_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "-tgu_result"],
+                name="tournament__categor_c7109c_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "-see_saw_press_result"],
+                name="tournament__categor_d742e6_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "-kb_squat_result"],
+                name="tournament__categor_76ce79_idx",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="categoryresult",
+            index=models.Index(
+                fields=["category", "-pistol_squat_result"],
+                name="tournament__categor_5d73bc_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,396 @@
+# Generated by Django 5.1 on 2026-10-18 07:03
+
+import django.db.models.expressions
+import django.db.models.functions.comparison
+import django.db.models.functions.math
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0005_categoryresult_ranking_indexes"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="player",
+            name="kb_squat_body_percent",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.comparison.Greatest(
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("kb_squat_weight_left_1__gt", 0),
+                                                ("kb_squat_weight_right_1__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                models.F("kb_squat_weight_left_1"),
+                                                "+",
+                                                models.F("kb_squat_weight_right_1"),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("kb_squat_weight_left_2__gt", 0),
+                                                ("kb_squat_weight_right_2__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                models.F("kb_squat_weight_left_2"),
+                                                "+",
+                                                models.F("kb_squat_weight_right_2"),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("kb_squat_weight_left_3__gt", 0),
+                                                ("kb_squat_weight_right_3__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                models.F("kb_squat_weight_left_3"),
+                                                "+",
+                                                models.F("kb_squat_weight_right_3"),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                ),
+                                "/",
+                                models.F("weight"),
+                            ),
+                            "*",
+                            models.Value(100),
+                        ),
+                        weight__gt=0,
+                    )
+                ),
+                output_field=models.FloatField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="kb_squat_result",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Greatest(
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("kb_squat_weight_left_1__gt", 0),
+                                ("kb_squat_weight_right_1__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                models.F("kb_squat_weight_left_1"),
+                                "+",
+                                models.F("kb_squat_weight_right_1"),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("kb_squat_weight_left_2__gt", 0),
+                                ("kb_squat_weight_right_2__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                models.F("kb_squat_weight_left_2"),
+                                "+",
+                                models.F("kb_squat_weight_right_2"),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("kb_squat_weight_left_3__gt", 0),
+                                ("kb_squat_weight_right_3__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                models.F("kb_squat_weight_left_3"),
+                                "+",
+                                models.F("kb_squat_weight_right_3"),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="pistol_squat_body_percent",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.comparison.Greatest(
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "pistol_squat_weight_1", 0.0
+                                    ),
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "pistol_squat_weight_2", 0.0
+                                    ),
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "pistol_squat_weight_3", 0.0
+                                    ),
+                                ),
+                                "/",
+                                models.F("weight"),
+                            ),
+                            "*",
+                            models.Value(100),
+                        ),
+                        weight__gt=0,
+                    )
+                ),
+                output_field=models.FloatField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="pistol_squat_result",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Greatest(
+                    django.db.models.functions.comparison.Coalesce(
+                        "pistol_squat_weight_1", 0.0
+                    ),
+                    django.db.models.functions.comparison.Coalesce(
+                        "pistol_squat_weight_2", 0.0
+                    ),
+                    django.db.models.functions.comparison.Coalesce(
+                        "pistol_squat_weight_3", 0.0
+                    ),
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="see_saw_press_body_percent",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.comparison.Greatest(
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("weight__gt", 0),
+                                                ("see_saw_press_weight_left_1__gt", 0),
+                                                ("see_saw_press_weight_right_1__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_left_1", 1
+                                                ),
+                                                "+",
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_right_1", 1
+                                                ),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("weight__gt", 0),
+                                                ("see_saw_press_weight_left_2__gt", 0),
+                                                ("see_saw_press_weight_right_2__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_left_2", 1
+                                                ),
+                                                "+",
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_right_2", 1
+                                                ),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                    models.Case(
+                                        models.When(
+                                            models.Q(
+                                                ("weight__gt", 0),
+                                                ("see_saw_press_weight_left_3__gt", 0),
+                                                ("see_saw_press_weight_right_3__gt", 0),
+                                            ),
+                                            then=django.db.models.expressions.CombinedExpression(
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_left_3", 1
+                                                ),
+                                                "+",
+                                                django.db.models.functions.math.Round(
+                                                    "see_saw_press_weight_right_3", 1
+                                                ),
+                                            ),
+                                        ),
+                                        default=0.0,
+                                    ),
+                                ),
+                                "/",
+                                models.F("weight"),
+                            ),
+                            "*",
+                            models.Value(100),
+                        ),
+                        weight__gt=0,
+                    )
+                ),
+                output_field=models.FloatField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="see_saw_press_result",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Greatest(
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("weight__gt", 0),
+                                ("see_saw_press_weight_left_1__gt", 0),
+                                ("see_saw_press_weight_right_1__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_left_1", 1
+                                ),
+                                "+",
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_right_1", 1
+                                ),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("weight__gt", 0),
+                                ("see_saw_press_weight_left_2__gt", 0),
+                                ("see_saw_press_weight_right_2__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_left_2", 1
+                                ),
+                                "+",
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_right_2", 1
+                                ),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                    models.Case(
+                        models.When(
+                            models.Q(
+                                ("weight__gt", 0),
+                                ("see_saw_press_weight_left_3__gt", 0),
+                                ("see_saw_press_weight_right_3__gt", 0),
+                            ),
+                            then=django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_left_3", 1
+                                ),
+                                "+",
+                                django.db.models.functions.math.Round(
+                                    "see_saw_press_weight_right_3", 1
+                                ),
+                            ),
+                        ),
+                        default=0.0,
+                    ),
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="snatch_result",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.math.Round(
+                    django.db.models.expressions.CombinedExpression(
+                        django.db.models.functions.comparison.Coalesce(
+                            "snatch_kettlebell_weight", 0.0
+                        ),
+                        "*",
+                        django.db.models.functions.comparison.Coalesce(
+                            "snatch_repetitions", 0
+                        ),
+                    ),
+                    1,
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="tgu_body_percent",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Case(
+                    models.When(
+                        then=django.db.models.expressions.CombinedExpression(
+                            django.db.models.expressions.CombinedExpression(
+                                django.db.models.functions.comparison.Greatest(
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "tgu_weight_1", 0.0
+                                    ),
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "tgu_weight_2", 0.0
+                                    ),
+                                    django.db.models.functions.comparison.Coalesce(
+                                        "tgu_weight_3", 0.0
+                                    ),
+                                ),
+                                "/",
+                                models.F("weight"),
+                            ),
+                            "*",
+                            models.Value(100),
+                        ),
+                        weight__gt=0,
+                    )
+                ),
+                output_field=models.FloatField(null=True),
+            ),
+        ),
+        migrations.AddField(
+            model_name="player",
+            name="tgu_result",
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=django.db.models.functions.comparison.Greatest(
+                    django.db.models.functions.comparison.Coalesce("tgu_weight_1", 0.0),
+                    django.db.models.functions.comparison.Coalesce("tgu_weight_2", 0.0),
+                    django.db.models.functions.comparison.Coalesce("tgu_weight_3", 0.0),
+                ),
+                output_field=models.FloatField(),
+            ),
+        ),
+    ]
@@ -0,0 +1,39 @@
+# Generated by Django 5.1 on 2026-10-18 07:13
+
+from django.db import migrations, models
+from django.utils.text import slugify
+
+
+def populate_slugs(apps, schema_editor):
+    Category = apps.get_model("tournament", "Category")
+    used = set()
+    for category in Category.objects.order_by("pk"):
+        base = slug = slugify(category.name.replace("_", "-"))
+        suffix = 2
+        while slug in used:
+            slug = f"{base}-{suffix}"
+            suffix += 1
+        used.add(slug)
+        category.slug = slug
+        category.save(update_fields=["slug"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0006_player_generated_results"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="slug",
+            field=models.SlugField(blank=True, max_length=100),
+        ),
+        migrations.RunPython(populate_slugs, migrations.RunPython.noop),
+        migrations.AlterField(
+            model_name="category",
+            name="slug",
+            field=models.SlugField(blank=True, max_length=100, unique=True),
+        ),
+    ]
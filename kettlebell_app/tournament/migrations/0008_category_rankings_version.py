@@ -0,0 +1,18 @@
+# Generated by Django 5.1 on 2026-10-18 07:35
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("tournament", "0007_category_slug"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="category",
+            name="rankings_version",
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
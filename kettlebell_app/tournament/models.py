@@ -1,6 +1,13 @@
-from django.db import models
-from django.db.models import F
-from django.db.models.functions import Greatest
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import models, transaction
+from django.db.models import Case, F, OuterRef, Q, Subquery, Value, When
+from django.db.models.functions import Coalesce, Greatest, Round
+from django.dispatch import Signal
+from django.utils import timezone
+from django.utils.text import slugify
 
 # Discipline constants
 SNATCH = "snatch"
@@ -17,6 +24,93 @@ AVAILABLE_DISCIPLINES = [
     (PISTOL_SQUAT, "Pistol Squat"),
 ]
 
+# Sent with ``category`` whenever results shown for a category may have changed
+category_results_changed = Signal()
+
+# Player fields each discipline's derived results are computed from
+DISCIPLINE_PLAYER_FIELDS = {
+    SNATCH: ("snatch_kettlebell_weight", "snatch_repetitions"),
+    TGU: ("tgu_weight_1", "tgu_weight_2", "tgu_weight_3"),
+    SEE_SAW_PRESS: (
+        "weight",
+        "see_saw_press_weight_left_1",
+        "see_saw_press_weight_left_2",
+        "see_saw_press_weight_left_3",
+        "see_saw_press_weight_right_1",
+        "see_saw_press_weight_right_2",
+        "see_saw_press_weight_right_3",
+    ),
+    KB_SQUAT: (
+        "kb_squat_weight_left_1",
+        "kb_squat_weight_left_2",
+        "kb_squat_weight_left_3",
+        "kb_squat_weight_right_1",
+        "kb_squat_weight_right_2",
+        "kb_squat_weight_right_3",
+    ),
+    PISTOL_SQUAT: (
+        "pistol_squat_weight_1",
+        "pistol_squat_weight_2",
+        "pistol_squat_weight_3",
+    ),
+}
+
+
+def get_affected_disciplines(fields):
+    """Return the disciplines whose derived results depend on ``fields``."""
+    return {
+        discipline
+        for discipline, discipline_fields in DISCIPLINE_PLAYER_FIELDS.items()
+        if set(fields).intersection(discipline_fields)
+    }
+
+
+def _best_of(*fields):
+    return Greatest(*(Coalesce(field, 0.0) for field in fields))
+
+
+def _best_pair(side_fields, condition=Q(), precision=None):
+    """Best sum of an attempt where both the left and the right side counted."""
+    attempts = []
+    for left, right in side_fields:
+        condition_met = condition & Q(**{f"{left}__gt": 0, f"{right}__gt": 0})
+        total = (
+            F(left) + F(right)
+            if precision is None
+            else Round(left, precision) + Round(right, precision)
+        )
+        attempts.append(Case(When(condition_met, then=total), default=0.0))
+    return Greatest(*attempts)
+
+
+def _body_percent(expression):
+    return Case(When(weight__gt=0, then=expression / F("weight") * 100))
+
+
+def _pair_fields(prefix):
+    return [(f"{prefix}_left_{i}", f"{prefix}_right_{i}") for i in range(1, 4)]
+
+
+SNATCH_RESULT = Round(
+    Coalesce("snatch_kettlebell_weight", 0.0) * Coalesce("snatch_repetitions", 0), 1
+)
+TGU_RESULT = _best_of("tgu_weight_1", "tgu_weight_2", "tgu_weight_3")
+SEE_SAW_PRESS_RESULT = _best_pair(
+    _pair_fields("see_saw_press_weight"), Q(weight__gt=0), precision=1
+)
+KB_SQUAT_RESULT = _best_pair(_pair_fields("kb_squat_weight"))
+PISTOL_SQUAT_RESULT = _best_of(
+    "pistol_squat_weight_1", "pistol_squat_weight_2", "pistol_squat_weight_3"
+)
+
+
+def _generated(expression, null=False):
+    return models.GeneratedField(
+        expression=expression,
+        output_field=models.FloatField(null=null),
+        db_persist=True,
+    )
+
 
 class SportClub(models.Model):
     name = models.CharField(max_length=100)
@@ -25,13 +119,49 @@ class SportClub(models.Model):
         return self.name
 
 
+# First path segments of fixed routes, which category pages must not shadow
+RESERVED_SLUGS = {"admin", "cache-stats", "export", "metrics", "static"}
+
+
+def category_slug(name, taken=()):
+    """Slug for a new category called ``name``, not already in ``taken``.
+
+    Names that slugify to the same value get a numeric suffix. Names with
+    nothing to slugify or that would shadow a fixed route are rejected.
+    """
+    base = slugify(name.replace("_", "-"))
+    if not base:
+        raise ValidationError(f"Nazwa kategorii {name!r} nie nadaje się na adres")
+    if base in RESERVED_SLUGS:
+        raise ValidationError(f"Nazwa kategorii {name!r} jest zarezerwowana")
+    slug, suffix = base, 2
+    while slug in taken:
+        slug = f"{base}-{suffix}"
+        suffix += 1
+    return slug
+
+
 class Category(models.Model):
     name = models.CharField(max_length=100)
+    # Filled from the name on save; bulk creators must set it themselves
+    slug = models.SlugField(max_length=100, unique=True, blank=True)
     disciplines = models.JSONField(default=list)
+    rankings_dirty_since = models.DateTimeField(null=True, blank=True)
+    # Bumped by every mark_rankings_dirty, so the worker can tell whether the
+    # category was marked again while it was being recomputed
+    rankings_version = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return self.name
 
+    def save(self, *args, **kwargs):
+        if not self.slug:
+            taken = Category.objects.exclude(pk=self.pk).values_list("slug", flat=True)
+            self.slug = category_slug(self.name, set(taken))
+        elif self.slug in RESERVED_SLUGS:
+            raise ValidationError(f"Adres {self.slug!r} jest zarezerwowany")
+        super().save(*args, **kwargs)
+
     def set_disciplines(self, disciplines):
         valid_disciplines = [d[0] for d in AVAILABLE_DISCIPLINES]
         self.disciplines = [d for d in disciplines if d in valid_disciplines]
@@ -74,124 +204,150 @@ class Player(models.Model):
     pistol_squat_weight_3 = models.FloatField(null=True, blank=True, default=0)
     tiebreak = models.BooleanField(default=False)
 
+    # Best result of each discipline and its share of the body weight,
+    # computed by the database whenever the attempts change
+    snatch_result = _generated(SNATCH_RESULT)
+    tgu_result = _generated(TGU_RESULT)
+    see_saw_press_result = _generated(SEE_SAW_PRESS_RESULT)
+    kb_squat_result = _generated(KB_SQUAT_RESULT)
+    pistol_squat_result = _generated(PISTOL_SQUAT_RESULT)
+    tgu_body_percent = _generated(_body_percent(TGU_RESULT), null=True)
+    see_saw_press_body_percent = _generated(
+        _body_percent(SEE_SAW_PRESS_RESULT), null=True
+    )
+    kb_squat_body_percent = _generated(_body_percent(KB_SQUAT_RESULT), null=True)
+    pistol_squat_body_percent = _generated(
+        _body_percent(PISTOL_SQUAT_RESULT), null=True
+    )
+
     _updating_results = False
 
-    def update_results(self):
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using, fields, from_queryset)
+        self._snapshot_loaded_values(fields)
+
+    def _snapshot_loaded_values(self, update_fields=None):
+        """Remember the current values of ``update_fields`` (names or attnames)."""
+        loaded = getattr(self, "_loaded_values", None)
+        if update_fields is None or loaded is None:
+            loaded = self._loaded_values = {}
+        else:
+            update_fields = {
+                self._meta.get_field(name).attname for name in update_fields
+            }
+        for field in self._meta.concrete_fields:
+            if field.attname in self.__dict__ and (
+                update_fields is None or field.attname in update_fields
+            ):
+                loaded[field.attname] = getattr(self, field.attname)
+
+    def get_changed_fields(self):
+        """Return names of fields changed since load, or None if unknown."""
+        loaded = getattr(self, "_loaded_values", None)
+        if self._state.adding or loaded is None:
+            return None
+        return {
+            field.attname
+            for field in self._meta.concrete_fields
+            if field.attname in self.__dict__
+            and (
+                field.attname not in loaded
+                or getattr(self, field.attname) != loaded[field.attname]
+            )
+        }
+
+    def update_results(self, changed_fields=None):
+        """Refresh derived results affected by ``changed_fields``.
+
+        ``None`` means the changes are unknown and everything is recomputed.
+        """
         if self._updating_results:
             return
         self._updating_results = True
         try:
-            self._update_snatch_result()
-            self._update_tgu_result()
-            self._update_see_saw_press_result()
-            self._update_kb_squat_result()
-            self._update_best_kb_squat_result()
-            self._update_best_see_saw_press_result()
-            self._update_pistol_squat_result()
-            self._update_overall_result()
+            if changed_fields is None:
+                disciplines = set(DISCIPLINE_PLAYER_FIELDS)
+            else:
+                disciplines = get_affected_disciplines(changed_fields)
+            self._update_category_results(disciplines)
+
+            if changed_fields is None or "tiebreak" in changed_fields:
+                self._update_overall_result()
+            elif changed_fields:
+                self._update_overall_result(disciplines)
         finally:
             self._updating_results = False
 
+    def _update_category_results(self, disciplines):
+        copy_player_results(CategoryResult.objects.filter(player=self), disciplines)
+
+    def _expire_generated_fields(self):
+        """Drop stale generated values so the next access reloads them."""
+        for field in self._meta.concrete_fields:
+            if field.generated:
+                self.__dict__.pop(field.attname, None)
+
     def kb_squat_body_percent_weight(self, side, attempt):
         weight = getattr(self, f"kb_squat_weight_{side}_{attempt}")
         return weight
 
-    def _update_snatch_result(self):
-        snatch_result, _ = SnatchResult.objects.get_or_create(player=self)
-        snatch_result.result = round(self.snatch_results() or 0, 1)
-        snatch_result.save()
-
-    def _update_tgu_result(self):
-        tgu_result, _ = TGUResult.objects.get_or_create(player=self)
-        tgu_result.result_1 = self.tgu_weight_1 or 0
-        tgu_result.result_2 = self.tgu_weight_2 or 0
-        tgu_result.result_3 = self.tgu_weight_3 or 0
-        tgu_result.save()
-
-    def _update_pistol_squat_result(self):
-        pistol_squat_result, _ = PistolSquatResult.objects.get_or_create(player=self)
-        pistol_squat_result.result_1 = self.pistol_squat_weight_1 or 0
-        pistol_squat_result.result_2 = self.pistol_squat_weight_2 or 0
-        pistol_squat_result.result_3 = self.pistol_squat_weight_3 or 0
-        pistol_squat_result.save()
-
-    def _update_see_saw_press_result(self):
-        see_saw_result, _ = SeeSawPressResult.objects.get_or_create(player=self)
-        for side in ["left", "right"]:
-            for attempt in range(1, 4):
-                setattr(
-                    see_saw_result,
-                    f"result_{side}_{attempt}",
-                    round(
-                        getattr(self, f"see_saw_press_body_percent_weight_{side}")(
-                            attempt
-                        )
-                        or 0,
-                        1,
-                    ),
-                )
-        see_saw_result.save()
-
-    def _update_kb_squat_result(self):
-        kb_squat_result, _ = KBSquatResult.objects.get_or_create(player=self)
-        for side in ["left", "right"]:
-            for attempt in range(1, 4):
-                setattr(
-                    kb_squat_result,
-                    f"result_{side}_{attempt}",
-                    self.kb_squat_body_percent_weight(side, attempt),
-                )
-        kb_squat_result.save()
-
-    def _update_best_kb_squat_result(self):
-        best_kb_squat_result, _ = BestKBSquatResult.objects.get_or_create(player=self)
-        best_kb_squat_result.update_best_result()
-
-    def _update_best_see_saw_press_result(self):
-        best_see_saw_result, _ = BestSeeSawPressResult.objects.get_or_create(
-            player=self
-        )
-        best_see_saw_result.update_best_results()
+    def get_see_saw_press_attempts(self):
+        """Return ``(left, right)`` of each attempt, 0.0 for missing ones."""
+        return [
+            (
+                round(self.see_saw_press_body_percent_weight_left(attempt) or 0.0, 1),
+                round(self.see_saw_press_body_percent_weight_right(attempt) or 0.0, 1),
+            )
+            for attempt in range(1, 4)
+        ]
 
-    def _update_overall_result(self):
-        for category in self.categories.all():
-            update_overall_results(category)
+    def get_kb_squat_attempts(self):
+        """Return ``(left, right)`` of each attempt, 0.0 for missing ones."""
+        return [
+            (
+                self.kb_squat_body_percent_weight("left", attempt) or 0.0,
+                self.kb_squat_body_percent_weight("right", attempt) or 0.0,
+            )
+            for attempt in range(1, 4)
+        ]
 
-    def get_max_pistol_squat_weight(self):
-        return max(
-            self.pistol_squat_weight_1 or 0,
-            self.pistol_squat_weight_2 or 0,
-            self.pistol_squat_weight_3 or 0,
-        )
+    def _update_overall_result(self, disciplines=None):
+        reranked, changed = [], []
+        for category in self.categories.all():
+            if disciplines is None or disciplines.intersection(
+                category.get_disciplines()
+            ):
+                reranked.append(category)
+            else:
+                changed.append(category)
+        refresh_category_rankings(reranked)
+        for category in changed:
+            category_results_changed.send(sender=Category, category=category)
 
     def save(self, *args, **kwargs):
+        changed_fields = self.get_changed_fields()
+        update_fields = kwargs.get("update_fields")
+        if changed_fields is not None and update_fields is not None:
+            changed_fields &= {
+                self._meta.get_field(name).attname for name in update_fields
+            }
+        adding = self._state.adding
         super().save(*args, **kwargs)
+        if not adding:
+            self._expire_generated_fields()
+        self._snapshot_loaded_values(update_fields)
         if not self._updating_results:
-            self.update_results()
+            self.update_results(changed_fields)
 
     def __str__(self):
         return f"{self.name} {self.surname}"
 
-    def snatch_results(self):
-        if self.snatch_kettlebell_weight and self.snatch_repetitions:
-            return self.snatch_kettlebell_weight * self.snatch_repetitions
-        return None
-
-    def tgu_body_percent_weight(self):
-        max_tgu_weight = max(
-            self.tgu_weight_1 or 0, self.tgu_weight_2 or 0, self.tgu_weight_3 or 0
-        )
-        return (
-            (max_tgu_weight / self.weight) * 100
-            if max_tgu_weight and self.weight
-            else None
-        )
-
-    def get_max_tgu_weight(self):
-        return max(
-            self.tgu_weight_1 or 0, self.tgu_weight_2 or 0, self.tgu_weight_3 or 0
-        )
-
     def see_saw_press_body_percent_weight_left(self, attempt):
         weight = getattr(self, f"see_saw_press_weight_left_{attempt}")
         return weight if weight and self.weight else None
@@ -201,259 +357,259 @@ class Player(models.Model):
         return weight if weight and self.weight else None
 
 
-class SnatchResult(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE)
-    result = models.FloatField(null=True, blank=True)
-    position = models.IntegerField(null=True, blank=True)
-
-    def __str__(self):
-        return f"{self.player} - Snatch: {self.result if self.result is not None else 'N/A'}"
-
-
-class TGUResult(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE)
-    result_1 = models.FloatField(default=0)
-    result_2 = models.FloatField(default=0)
-    result_3 = models.FloatField(default=0)
-    position = models.IntegerField(null=True, blank=True)
+class CategoryResult(models.Model):
+    """Results and standings of a player within one category."""
 
-    def __str__(self):
-        return f"{self.player} - TGU Results"
+    player = models.ForeignKey(
+        Player, on_delete=models.CASCADE, related_name="category_results"
+    )
+    category = models.ForeignKey(
+        Category, on_delete=models.CASCADE, related_name="results"
+    )
 
-    def get_max_result(self):
-        return max(self.result_1 or 0, self.result_2 or 0, self.result_3 or 0)
+    snatch_result = models.FloatField(default=0)
+    tgu_result = models.FloatField(default=0)
+    see_saw_press_result = models.FloatField(default=0)
+    kb_squat_result = models.FloatField(default=0)
+    pistol_squat_result = models.FloatField(default=0)
 
-    def calculate_bw_percentage(self):
-        if self.player.weight:
-            max_result = self.get_max_result()
-            return (max_result / self.player.weight) * 100
-        return 0
+    snatch_position = models.IntegerField(null=True, blank=True)
+    tgu_position = models.IntegerField(null=True, blank=True)
+    see_saw_press_position = models.IntegerField(null=True, blank=True)
+    kb_squat_position = models.IntegerField(null=True, blank=True)
+    pistol_squat_position = models.IntegerField(null=True, blank=True)
 
+    total_points = models.IntegerField(default=0)
+    final_score = models.FloatField(default=0)
+    final_position = models.IntegerField(null=True, blank=True)
 
-class PistolSquatResult(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE)
-    result_1 = models.FloatField(default=0)
-    result_2 = models.FloatField(default=0)
-    result_3 = models.FloatField(default=0)
-    position = models.IntegerField(null=True, blank=True)
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["player", "category"], name="unique_player_category_result"
+            )
+        ]
+        indexes = [
+            models.Index(fields=["category", "final_position"]),
+            # Serve the per-discipline ranking ORDER BY of update_overall_results
+            models.Index(fields=["category", "-snatch_result"]),
+            models.Index(fields=["category", "-tgu_result"]),
+            models.Index(fields=["category", "-see_saw_press_result"]),
+            models.Index(fields=["category", "-kb_squat_result"]),
+            models.Index(fields=["category", "-pistol_squat_result"]),
+        ]
 
     def __str__(self):
-        return f"{self.player} - Pistol Squat Results"
+        return f"{self.player} - {self.category}: {self.final_position}"
 
-    def get_max_result(self):
-        return max(self.result_1 or 0, self.result_2 or 0, self.result_3 or 0)
 
-    def calculate_bw_percentage(self):
-        if self.player.weight:
-            max_result = self.get_max_result()
-            return (max_result / self.player.weight) * 100
-        return 0
-
-
-class SeeSawPressResult(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE)
-    result_left_1 = models.FloatField(default=0)
-    result_right_1 = models.FloatField(default=0)
-    result_left_2 = models.FloatField(default=0)
-    result_right_2 = models.FloatField(default=0)
-    result_left_3 = models.FloatField(default=0)
-    result_right_3 = models.FloatField(default=0)
-    position = models.IntegerField(null=True, blank=True)
+class CategoryLeaderboard(models.Model):
+    category = models.OneToOneField(
+        Category, on_delete=models.CASCADE, related_name="leaderboard"
+    )
+    version = models.PositiveIntegerField(default=0)
+    data = models.JSONField(default=dict)
+    updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self):
-        return f"{self.player} - See Saw Press Results"
-
-    def get_attempt_result(self, attempt_number):
-        left = getattr(self, f"result_left_{attempt_number}")
-        right = getattr(self, f"result_right_{attempt_number}")
-        return (left * 3) + (right * 3) if left > 0 and right > 0 else 0
-
-    def get_max_result(self):
-        valid_attempts = [
-            self.result_left_1 + self.result_right_1
-            if self.result_left_1 > 0 and self.result_right_1 > 0
-            else 0,
-            self.result_left_2 + self.result_right_2
-            if self.result_left_2 > 0 and self.result_right_2 > 0
-            else 0,
-            self.result_left_3 + self.result_right_3
-            if self.result_left_3 > 0 and self.result_right_3 > 0
-            else 0,
-        ]
-        return max(valid_attempts)
-
+        return f"{self.category} - v{self.version}"
+
+
+DISCIPLINE_RESULT_FIELDS = {
+    SNATCH: "snatch_result",
+    TGU: "tgu_result",
+    SEE_SAW_PRESS: "see_saw_press_result",
+    KB_SQUAT: "kb_squat_result",
+    PISTOL_SQUAT: "pistol_squat_result",
+}
+
+DISCIPLINE_POSITION_FIELDS = {
+    SNATCH: "snatch_position",
+    TGU: "tgu_position",
+    SEE_SAW_PRESS: "see_saw_press_position",
+    KB_SQUAT: "kb_squat_position",
+    PISTOL_SQUAT: "pistol_squat_position",
+}
+
+STANDING_FIELDS = [
+    *DISCIPLINE_POSITION_FIELDS.values(),
+    "total_points",
+    "final_score",
+    "final_position",
+]
 
-class BestSeeSawPressResult(models.Model):
-    player = models.OneToOneField(Player, on_delete=models.CASCADE)
-    best_left = models.FloatField(default=0)
-    best_right = models.FloatField(default=0)
 
-    def update_best_results(self):
-        see_saw_result = self.player.seesawpressresult_set.first()
-        if see_saw_result:
-            self.best_left = max(
-                see_saw_result.result_left_1,
-                see_saw_result.result_left_2,
-                see_saw_result.result_left_3,
-            )
-            self.best_right = max(
-                see_saw_result.result_right_1,
-                see_saw_result.result_right_2,
-                see_saw_result.result_right_3,
+def update_overall_results(category):
+    """Recompute the standings of the category in a single pass.
+
+    ``CategoryResult`` rows are created or removed to match the category's
+    players, each discipline is ranked with one indexed ``ORDER BY`` and the
+    standings that changed are written back with a single ``bulk_update``.
+    """
+    disciplines = [
+        d for d in category.get_disciplines() if d in DISCIPLINE_RESULT_FIELDS
+    ]
+    with transaction.atomic():
+        _sync_category_results(category)
+        _rank_category_results(category, disciplines)
+    category_results_changed.send(sender=Category, category=category)
+
+
+def _sync_category_results(category):
+    CategoryResult.objects.filter(category=category).exclude(
+        player__categories=category
+    ).delete()
+    missing = Player.objects.filter(categories=category).exclude(
+        category_results__category=category
+    )
+    result_fields = list(DISCIPLINE_RESULT_FIELDS.values())
+    CategoryResult.objects.bulk_create(
+        [
+            CategoryResult(
+                player_id=values[0],
+                category=category,
+                **dict(zip(result_fields, values[1:])),
             )
-            self.save()
-
-    def __str__(self):
-        return f"{self.player} - Best See Saw Press: Left {self.best_left}, Right {self.best_right}"
-
+            for values in missing.values_list("pk", *result_fields)
+        ]
+    )
 
-class KBSquatResult(models.Model):
-    player = models.ForeignKey(Player, on_delete=models.CASCADE)
-    result_left_1 = models.FloatField(default=0)
-    result_right_1 = models.FloatField(default=0)
-    result_left_2 = models.FloatField(default=0)
-    result_right_2 = models.FloatField(default=0)
-    result_left_3 = models.FloatField(default=0)
-    result_right_3 = models.FloatField(default=0)
-    position = models.IntegerField(null=True, blank=True)
 
-    def __str__(self):
-        return f"{self.player} - KB Squat Results"
-
-    def get_max_result(self):
-        valid_attempts = [
-            self.result_left_1 + self.result_right_1
-            if self.result_left_1 > 0 and self.result_right_1 > 0
-            else 0,
-            self.result_left_2 + self.result_right_2
-            if self.result_left_2 > 0 and self.result_right_2 > 0
-            else 0,
-            self.result_left_3 + self.result_right_3
-            if self.result_left_3 > 0 and self.result_right_3 > 0
-            else 0,
-        ]
-        return max(valid_attempts)
+def copy_player_results(results, disciplines):
+    """Copy the players' generated maxima of ``disciplines`` into ``results``.
 
-    def get_attempt_result(self, attempt_number):
-        left = getattr(self, f"result_left_{attempt_number}")
-        right = getattr(self, f"result_right_{attempt_number}")
-        return max(left, right) if left > 0 and right > 0 else 0
+    A single ``UPDATE`` with one correlated subquery per column; the copies
+    keep the per-category ranking indexes on ``CategoryResult``.
+    """
+    fields = [DISCIPLINE_RESULT_FIELDS[discipline] for discipline in disciplines]
+    if fields:
+        players = Player.objects.filter(pk=OuterRef("player_id"))
+        results.update(
+            **{field: Subquery(players.values(field)[:1]) for field in fields}
+        )
 
 
-class BestKBSquatResult(models.Model):
-    player = models.OneToOneField(Player, on_delete=models.CASCADE)
-    best_result = models.FloatField(default=0)
+def _rank(values):
+    """Map keys to competition ranks (1, 1, 3, ...) of the ordered ``values``."""
+    positions = {}
+    previous = None
+    for index, (key, value) in enumerate(values, start=1):
+        if value != previous:
+            position = index
+        positions[key] = position
+        previous = value
+    return positions
+
+
+def discipline_ranking_query(category, discipline):
+    """``(result_pk, value)`` rows of a discipline, best result first."""
+    field = DISCIPLINE_RESULT_FIELDS[discipline]
+    return (
+        CategoryResult.objects.filter(category=category)
+        .order_by(f"-{field}")
+        .values_list("pk", field)
+    )
 
-    def update_best_result(self):
-        kb_squat_result = self.player.kbsquatresult_set.first()
-        if kb_squat_result:
-            self.best_result = kb_squat_result.get_max_result()
-            self.save()
 
-    def __str__(self):
-        return f"{self.player} - Best KB Squat: {self.best_result}"
-
-
-class OverallResult(models.Model):
-    player = models.OneToOneField(Player, on_delete=models.CASCADE)
-    snatch_points = models.FloatField(default=0)
-    tgu_points = models.FloatField(default=0)
-    see_saw_press_points = models.FloatField(default=0)
-    kb_squat_points = models.FloatField(default=0)
-    pistol_squat_points = models.FloatField(default=0)
-    tiebreak_points = models.FloatField(default=0)
-    total_points = models.FloatField(default=0)
-    final_position = models.IntegerField(null=True, blank=True)
+def _rank_category_results(category, disciplines):
+    positions = {
+        discipline: _rank(discipline_ranking_query(category, discipline))
+        for discipline in disciplines
+    }
+    results = CategoryResult.objects.filter(category=category)
 
-    def calculate_total_points(self):
-        self.total_points = round(
-            self.snatch_points
-            + self.tgu_points
-            + self.see_saw_press_points
-            + self.kb_squat_points
-            + self.pistol_squat_points
-            + self.tiebreak_points,
-            1,
+    rows = list(
+        results.annotate(tiebreak=F("player__tiebreak")).only(
+            "player_id", *STANDING_FIELDS
+        )
+    )
+    previous = {
+        row.pk: [getattr(row, field) for field in STANDING_FIELDS] for row in rows
+    }
+    for row in rows:
+        row.total_points = 0
+        for discipline, position_field in DISCIPLINE_POSITION_FIELDS.items():
+            position = (
+                positions[discipline][row.pk] if discipline in positions else None
+            )
+            setattr(row, position_field, position)
+            row.total_points += position or 0
+        row.final_score = row.total_points - (0.5 if row.tiebreak else 0)
+
+    rows.sort(key=lambda row: (row.final_score, row.player_id))
+    final_positions = _rank((row.pk, row.final_score) for row in rows)
+    changed = []
+    for row in rows:
+        row.final_position = final_positions[row.pk]
+        if [getattr(row, field) for field in STANDING_FIELDS] != previous[row.pk]:
+            changed.append(row)
+    CategoryResult.objects.bulk_update(changed, STANDING_FIELDS)
+
+
+def bulk_update_results(players, fields):
+    """Save result ``fields`` of many players with a single ``bulk_update``.
+
+    Their ``CategoryResult`` rows are refreshed with one more ``UPDATE``
+    and each affected category is re-ranked only once.
+    """
+    if not players:
+        return
+    disciplines = get_affected_disciplines(fields)
+    with transaction.atomic():
+        Player.objects.bulk_update(players, fields)
+        for player in players:
+            player._expire_generated_fields()
+            player._snapshot_loaded_values(fields)
+        copy_player_results(
+            CategoryResult.objects.filter(player__in=players), disciplines
+        )
+        categories = Category.objects.filter(player__in=players).distinct()
+        refresh_category_rankings(
+            [
+                category
+                for category in categories
+                if disciplines.intersection(category.get_disciplines())
+            ]
         )
 
-    def save(self, *args, **kwargs):
-        self.calculate_total_points()
-        super().save(*args, **kwargs)
 
-    def __str__(self):
-        return f"{self.player} - Total: {self.total_points:.1f}"
+def refresh_category_rankings(categories):
+    """Re-rank categories now, or flag them for the background worker."""
+    if getattr(settings, "TOURNAMENT_DEFER_RANKINGS", False):
+        mark_rankings_dirty(categories)
+        return
+    for category in categories:
+        update_overall_results(category)
 
 
-def update_overall_results(category):
-    disciplines = category.get_disciplines()
-    players = Player.objects.filter(categories=category)
-
-    for player in players:
-        overall_result, created = OverallResult.objects.get_or_create(player=player)
-        overall_result.snatch_points = 0
-        overall_result.tgu_points = 0
-        overall_result.see_saw_press_points = 0
-        overall_result.kb_squat_points = 0
-        overall_result.pistol_squat_points = 0
-        overall_result.tiebreak_points = 0
-        overall_result.total_points = 0
-        overall_result.final_position = None
-        overall_result.save()
-
-    discipline_models = {
-        SNATCH: SnatchResult,
-        TGU: TGUResult,
-        SEE_SAW_PRESS: SeeSawPressResult,
-        KB_SQUAT: KBSquatResult,
-        PISTOL_SQUAT: PistolSquatResult,
-    }
+def mark_rankings_dirty(categories):
+    """Flag categories for the background ``recompute_rankings`` worker.
 
-    for discipline in disciplines:
-        if discipline in discipline_models:
-            model = discipline_models[discipline]
-            if discipline == SNATCH:
-                results = model.objects.filter(player__in=players).order_by("-result")
-            elif discipline in [TGU, PISTOL_SQUAT]:
-                results = (
-                    model.objects.filter(player__in=players)
-                    .annotate(max_result=Greatest("result_1", "result_2", "result_3"))
-                    .order_by("-max_result")
-                )
-            elif discipline in [SEE_SAW_PRESS, KB_SQUAT]:
-                results = (
-                    model.objects.filter(player__in=players)
-                    .annotate(
-                        max_result=Greatest(
-                            F("result_left_1") + F("result_right_1"),
-                            F("result_left_2") + F("result_right_2"),
-                            F("result_left_3") + F("result_right_3"),
-                        )
-                    )
-                    .order_by("-max_result")
-                )
-
-            for position, result in enumerate(results, start=1):
-                overall_result = OverallResult.objects.get(player=result.player)
-                if discipline == SNATCH:
-                    overall_result.snatch_points = position
-                elif discipline == TGU:
-                    overall_result.tgu_points = position
-                elif discipline == SEE_SAW_PRESS:
-                    overall_result.see_saw_press_points = position
-                elif discipline == KB_SQUAT:
-                    overall_result.kb_squat_points = position
-                elif discipline == PISTOL_SQUAT:
-                    overall_result.pistol_squat_points = position
-                overall_result.save()
-
-    for player in players:
-        overall_result = OverallResult.objects.get(player=player)
-        overall_result.tiebreak_points = -0.5 if player.tiebreak else 0
-        overall_result.save()
-
-    final_results = OverallResult.objects.filter(player__in=players).order_by(
-        "total_points"
+    Categories that are already dirty keep their original timestamp, so a
+    burst of saves is coalesced into a single recomputation. Every mark
+    still bumps ``rankings_version``, so it writes (and locks) the row even
+    when the category is already dirty.
+    """
+    Category.objects.filter(pk__in=[category.pk for category in categories]).update(
+        rankings_dirty_since=Coalesce("rankings_dirty_since", Value(timezone.now())),
+        rankings_version=F("rankings_version") + 1,
     )
-    for position, result in enumerate(final_results, start=1):
-        result.final_position = position
-        result.save()
+
+
+def recompute_dirty_rankings(window=0):
+    """Recompute categories that have been dirty for at least ``window`` seconds.
+
+    Returns the list of recomputed categories.
+    """
+    cutoff = timezone.now() - timedelta(seconds=window)
+    recomputed = []
+    for category in Category.objects.filter(rankings_dirty_since__lte=cutoff):
+        update_overall_results(category)
+        recomputed.append(category)
+        # Clear the flag only if nobody marked the category since it was read.
+        # A save still in progress holds the row lock, so this waits for it
+        # and then leaves the category dirty for the next pass.
+        Category.objects.filter(
+            pk=category.pk, rankings_version=category.rankings_version
+        ).update(rankings_dirty_since=None)
+    return recomputed
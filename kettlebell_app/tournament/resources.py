@@ -1,16 +1,44 @@
 import logging
 
-from django.core.exceptions import MultipleObjectsReturned, ObjectDoesNotExist
+from django.db.models import Prefetch
 from import_export import fields, resources
+from import_export.instance_loaders import BaseInstanceLoader
 from import_export.widgets import ForeignKeyWidget, ManyToManyWidget
 
-from .models import Category, OverallResult, Player, SportClub
+from .models import (
+    Category,
+    CategoryResult,
+    Player,
+    SportClub,
+    category_slug,
+    refresh_category_rankings,
+)
 
 logger = logging.getLogger(__name__)
 
 
 class CustomForeignKeyWidget(ForeignKeyWidget):
+    cache = None
+
+    def preload(self, values):
+        """Fetch (or create) every object referenced by ``values`` up front."""
+        values = {value for value in values if value}
+        self.cache = {}
+        for obj in self.model.objects.filter(**{f"{self.field}__in": values}).order_by(
+            "pk"
+        ):
+            self.cache.setdefault(getattr(obj, self.field), obj)
+        missing = [
+            self.model(**{self.field: value})
+            for value in values
+            if value not in self.cache
+        ]
+        for obj in self.model.objects.bulk_create(missing):
+            self.cache[getattr(obj, self.field)] = obj
+
     def clean(self, value, row=None, *args, **kwargs):
+        if value and self.cache is not None and value in self.cache:
+            return self.cache[value]
         if value:
             try:
                 return self.get_queryset(value, row, *args, **kwargs).get(
@@ -23,6 +51,21 @@ class CustomForeignKeyWidget(ForeignKeyWidget):
         return None
 
 
+def player_key(row):
+    return (row["Imię"], row["Nazwisko"], row["Klub"])
+
+
+def split_categories(value):
+    return [name for name in (value or "").split(", ") if name]
+
+
+class PlayerInstanceLoader(BaseInstanceLoader):
+    """Finds players in the map preloaded by ``PlayerImportResource``."""
+
+    def get_instance(self, row):
+        return self.resource.players.get(player_key(row))
+
+
 class PlayerImportResource(resources.ModelResource):
     name = fields.Field(column_name="Imię", attribute="name")
     surname = fields.Field(column_name="Nazwisko", attribute="surname")
@@ -37,52 +80,97 @@ class PlayerImportResource(resources.ModelResource):
         widget=ManyToManyWidget(Category, field="name", separator=", "),
     )
 
+    def before_import(self, dataset, **kwargs):
+        club_names = set(dataset["Klub"])
+        self.fields["club"].widget.preload(club_names)
+
+        category_names = {
+            name for value in dataset["Kategoria"] for name in split_categories(value)
+        }
+        self.category_map = {
+            category.name: category
+            for category in Category.objects.filter(name__in=category_names)
+        }
+        taken = set(Category.objects.values_list("slug", flat=True))
+        missing = []
+        for name in sorted(category_names - self.category_map.keys()):
+            slug = category_slug(name, taken)
+            taken.add(slug)
+            missing.append(Category(name=name, slug=slug))
+        for category in Category.objects.bulk_create(missing):
+            self.category_map[category.name] = category
+            logger.info(f"Utworzono nową kategorię: {category.name}")
+
+        self.players = {}
+        for player in (
+            Player.objects.filter(club__name__in=club_names)
+            .select_related("club")
+            .order_by("pk")
+        ):
+            key = (player.name, player.surname, player.club.name)
+            if key in self.players:
+                logger.warning(
+                    f"Znaleziono wielu zawodników dla: {player.name} {player.surname} z klubu {player.club.name}"
+                )
+                continue
+            self.players[key] = player
+        self.category_links = []
+
     def before_import_row(self, row, **kwargs):
         logger.info(f"Przetwarzanie wiersza: {row}")
-        try:
-            player = Player.objects.get(
-                name=row["Imię"], surname=row["Nazwisko"], club__name=row["Klub"]
-            )
-            logger.info(f"Znaleziono istniejącego zawodnika: {player}")
-
-            categories = row["Kategoria"].split(", ")
-            for category_name in categories:
-                category, created = Category.objects.get_or_create(name=category_name)
-                if created:
-                    logger.info(f"Utworzono nową kategorię: {category_name}")
-                if not player.categories.filter(id=category.id).exists():
-                    player.categories.add(category)
-                    logger.info(
-                        f"Dodano kategorię {category_name} do zawodnika {player}"
-                    )
-                else:
-                    logger.info(
-                        f"Kategoria {category_name} już istnieje dla zawodnika {player}"
-                    )
-
-            row["skip_row"] = True
-            logger.info(f"Wiersz oznaczony do pominięcia dla zawodnika {player}")
-        except ObjectDoesNotExist:
+        player = self.players.get(player_key(row))
+        if player is None:
             logger.info(
                 f"Nie znaleziono istniejącego zawodnika dla: {row['Imię']} {row['Nazwisko']} z klubu {row['Klub']}"
             )
-        except MultipleObjectsReturned:
-            logger.warning(
-                f"Znaleziono wielu zawodników dla: {row['Imię']} {row['Nazwisko']} z klubu {row['Klub']}"
-            )
-            player = Player.objects.filter(
-                name=row["Imię"], surname=row["Nazwisko"], club__name=row["Klub"]
-            ).first()
-            logger.info(f"Wybrano pierwszego znalezionego zawodnika: {player}")
-        except Exception as e:
-            logger.error(
-                f"Wystąpił nieoczekiwany błąd podczas przetwarzania wiersza: {e}"
-            )
+            return
+        logger.info(f"Znaleziono istniejącego zawodnika: {player}")
+        self._link_categories(player, row)
+        row["skip_row"] = True
+        logger.info(f"Wiersz oznaczony do pominięcia dla zawodnika {player}")
+
+    def skip_row(self, instance, original, row, import_validation_errors=None):
+        if row.get("skip_row"):
+            return True
+        return super().skip_row(instance, original, row, import_validation_errors)
+
+    def after_save_instance(self, instance, row, **kwargs):
+        # With ``use_bulk`` the player is only queued here; later rows for the
+        # same athlete must find it instead of queueing a duplicate.
+        self.players[player_key(row)] = instance
+        self._link_categories(instance, row)
+
+    def _link_categories(self, player, row):
+        for category_name in split_categories(row["Kategoria"]):
+            category = self.category_map[category_name]
+            self.category_links.append((player, category))
+            logger.info(f"Dodano kategorię {category_name} do zawodnika {player}")
+
+    def after_import(self, dataset, result, **kwargs):
+        if self._is_dry_run(kwargs) and not self._is_using_transactions(kwargs):
+            return
+        # Queued players have been bulk created by now, so they have a pk.
+        through = Player.categories.through
+        links = {(player.pk, category.pk) for player, category in self.category_links}
+        through.objects.bulk_create(
+            [
+                through(player_id=player_id, category_id=category_id)
+                for player_id, category_id in links
+            ],
+            ignore_conflicts=True,
+        )
+        # Ranking creates the CategoryResult rows of the new players.
+        refresh_category_rankings(
+            {category.pk: category for _, category in self.category_links}.values()
+        )
 
     class Meta:
         model = Player
         fields = ("name", "surname", "club", "categories")
         import_id_fields = ["name", "surname", "club"]
+        instance_loader_class = PlayerInstanceLoader
+        use_bulk = True
+        batch_size = 500
 
 
 class PlayerExportResource(resources.ModelResource):
@@ -95,14 +183,14 @@ class PlayerExportResource(resources.ModelResource):
         widget=ManyToManyWidget(Category, field="name", separator=", "),
     )
     snatch_results = fields.Field(
-        column_name="Wyniki Rwania", attribute="snatch_results"
+        column_name="Wyniki Rwania", attribute="snatch_result"
     )
     snatch_position = fields.Field(
         column_name="Miejsce Rwanie", attribute="snatch_position"
     )
 
     tgu_body_percent = fields.Field(
-        column_name="TGU % Wagi Ciała", attribute="tgu_body_percent_weight"
+        column_name="TGU % Wagi Ciała", attribute="tgu_body_percent"
     )
     tgu_position = fields.Field(column_name="Miejsce TGU", attribute="tgu_position")
 
@@ -119,7 +207,7 @@ class PlayerExportResource(resources.ModelResource):
     )
 
     kb_squat_body_percent = fields.Field(
-        column_name="KB Squat % Wagi Ciała", attribute="kb_squat_body_percent_weight"
+        column_name="KB Squat % Wagi Ciała", attribute="kb_squat_body_percent"
     )
     kb_squat_position = fields.Field(
         column_name="Miejsce KB Squat", attribute="kb_squat_position"
@@ -174,98 +262,94 @@ class PlayerExportResource(resources.ModelResource):
         )
         export_order = fields
 
+    def __init__(self, category=None, **kwargs):
+        super().__init__(**kwargs)
+        # Positions are taken from this category, or from the player's first one
+        self.category = category
+
+    def filter_export(self, queryset, **kwargs):
+        return prefetch_export_results(super().filter_export(queryset, **kwargs))
+
+    def after_export(self, queryset, dataset, **kwargs):
+        logger.info(f"Wyeksportowano {len(dataset)} zawodników")
+
+    def export_resource(self, instance, fields=None):
+        row = super().export_resource(instance, fields)
+        logger.debug(f"Eksport zawodnika {instance}: {row}")
+        return row
+
+    def _category_result(self, player):
+        results = player.category_results.all()
+        for result in results:
+            if self.category is None or result.category_id == self.category.pk:
+                return result
+        return None
+
+    def _position(self, player, field):
+        result = self._category_result(player)
+        return getattr(result, field) if result else "N/A"
+
     def dehydrate_snatch_results(self, player):
-        result = (
-            player.snatch_results() if player.snatch_results() is not None else "N/A"
-        )
-        print(f"Exporting Snatch Results for {player}: {result}")
-        return result
+        return player.snatch_result or "N/A"
 
     def dehydrate_snatch_position(self, player):
-        snatch_result = player.snatchresult_set.first()
-        position = snatch_result.position if snatch_result else "N/A"
-        print(f"Exporting Snatch Position for {player}: {position}")
-        return position
+        return self._position(player, "snatch_position")
 
     def dehydrate_tgu_body_percent(self, player):
-        result = (
-            f"{player.tgu_body_percent_weight():.2f}%"
-            if player.tgu_body_percent_weight() is not None
-            else "N/A"
-        )
-        print(f"Exporting TGU Body Percent for {player}: {result}")
-        return result
+        return _format_percent(player.tgu_body_percent if player.tgu_result else None)
 
     def dehydrate_tgu_position(self, player):
-        tgu_result = player.tguresult_set.first()
-        position = tgu_result.position if tgu_result else "N/A"
-        print(f"Exporting TGU Position for {player}: {position}")
-        return position
+        return self._position(player, "tgu_position")
 
     def dehydrate_see_saw_press_body_percent_left(self, player):
-        result = (
-            f"{player.see_saw_press_body_percent_weight_left():.2f}%"
-            if player.see_saw_press_body_percent_weight_left() is not None
-            else "N/A"
-        )
-        print(f"Exporting See Saw Press Body Percent (Left) for {player}: {result}")
-        return result
+        best = max(left for left, _ in player.get_see_saw_press_attempts())
+        return _body_percent(best, player)
 
     def dehydrate_see_saw_press_body_percent_right(self, player):
-        result = (
-            f"{player.see_saw_press_body_percent_weight_right():.2f}%"
-            if player.see_saw_press_body_percent_weight_right() is not None
-            else "N/A"
-        )
-        print(f"Exporting See Saw Press Body Percent (Right) for {player}: {result}")
-        return result
+        best = max(right for _, right in player.get_see_saw_press_attempts())
+        return _body_percent(best, player)
 
     def dehydrate_see_saw_press_position(self, player):
-        see_saw_result = player.seesawpressresult_set.first()
-        position = see_saw_result.position if see_saw_result else "N/A"
-        print(f"Exporting See Saw Press Position for {player}: {position}")
-        return position
+        return self._position(player, "see_saw_press_position")
 
     def dehydrate_kb_squat_body_percent(self, player):
-        result = (
-            f"{player.kb_squat_body_percent_weight():.2f}%"
-            if player.kb_squat_body_percent_weight() is not None
-            else "N/A"
-        )
-        print(f"Exporting KB Squat Body Percent for {player}: {result}")
-        return result
+        return _format_percent(player.kb_squat_body_percent)
 
     def dehydrate_kb_squat_position(self, player):
-        kb_squat_result = player.kbsquatresult_set.first()
-        position = kb_squat_result.position if kb_squat_result else "N/A"
-        print(f"Exporting KB Squat Position for {player}: {position}")
-        return position
+        return self._position(player, "kb_squat_position")
 
     def dehydrate_pistol_squat_weight(self, player):
-        result = player.get_max_pistol_squat_weight()
-        print(f"Exporting Pistol Squat Weight for {player}: {result}")
-        return result
+        return player.pistol_squat_result
 
     def dehydrate_pistol_squat_body_percent(self, player):
-        weight = player.get_max_pistol_squat_weight()
-        result = f"{(weight / player.weight * 100):.2f}%" if player.weight else "N/A"
-        print(f"Exporting Pistol Squat Body Percent for {player}: {result}")
-        return result
+        return _format_percent(player.pistol_squat_body_percent)
 
     def dehydrate_pistol_squat_position(self, player):
-        pistol_squat_result = player.pistolsquatresult_set.first()
-        position = pistol_squat_result.position if pistol_squat_result else "N/A"
-        print(f"Exporting Pistol Squat Position for {player}: {position}")
-        return position
+        return self._position(player, "pistol_squat_position")
 
     def dehydrate_overall_points(self, player):
-        overall_result = OverallResult.objects.filter(player=player).first()
-        points = overall_result.total_points if overall_result else "N/A"
-        print(f"Exporting Overall Points for {player}: {points}")
-        return points
+        return self._position(player, "final_score")
 
     def dehydrate_overall_position(self, player):
-        overall_result = OverallResult.objects.filter(player=player).first()
-        position = overall_result.final_position if overall_result else "N/A"
-        print(f"Exporting Overall Position for {player}: {position}")
-        return position
+        return self._position(player, "final_position")
+
+
+def prefetch_export_results(queryset):
+    """Load everything the export columns need with a fixed number of queries."""
+    return queryset.select_related("club").prefetch_related(
+        "categories",
+        Prefetch(
+            "category_results",
+            queryset=CategoryResult.objects.order_by("category__name"),
+        ),
+    )
+
+
+def _body_percent(value, player):
+    if not player.weight:
+        return "N/A"
+    return _format_percent(value / player.weight * 100)
+
+
+def _format_percent(value):
+    return f"{value:.2f}%" if value is not None else "N/A"
@@ -0,0 +1,65 @@
+"""Cache of rendered category results pages and their leaderboard context.
+
+Entries are keyed per category and per generation. Invalidating a category
+bumps its generation (after the surrounding transaction commits), so a page
+rendered from an older leaderboard can never be served again.
+"""
+
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+stats = Counter()
+
+
+def _cache():
+    return caches[getattr(settings, "TOURNAMENT_RESULTS_CACHE", "default")]
+
+
+def _timeout():
+    return getattr(settings, "TOURNAMENT_RESULTS_CACHE_TIMEOUT", 300)
+
+
+def _generation(category_slug):
+    cache = _cache()
+    key = f"results:{category_slug}:generation"
+    # Start from the clock so an evicted generation never reuses old keys
+    cache.add(key, time.time_ns(), timeout=None)
+    return cache.get(key)
+
+
+def _key(category_slug, kind):
+    return f"results:{category_slug}:{_generation(category_slug)}:{kind}"
+
+
+def get_or_set(category_slug, kind, default):
+    """Return the cached ``kind`` entry of a category, storing ``default()`` on a miss."""
+    cache = _cache()
+    key = _key(category_slug, kind)
+    value = cache.get(key)
+    if value is None:
+        stats[f"{kind}_misses"] += 1
+        value = default()
+        cache.set(key, value, timeout=_timeout())
+    else:
+        stats[f"{kind}_hits"] += 1
+    return value
+
+
+def invalidate(category_slug):
+    """Drop every cached entry of a category once the current transaction commits."""
+
+    def bump():
+        cache = _cache()
+        key = f"results:{category_slug}:generation"
+        cache.set(key, max(time.time_ns(), (cache.get(key) or 0) + 1), timeout=None)
+        stats["invalidations"] += 1
+
+    transaction.on_commit(bump)
+
+
+def get_stats():
+    return dict(stats)
@@ -0,0 +1,232 @@
+"""Start lists: athletes spread over stations so the session ends early.
+
+Every athlete performs the disciplines of all their categories in one go
+(results are shared between categories), so an athlete entered in several
+categories is scheduled once, for the union of those disciplines. Each
+station can then be sequenced so consecutive athletes share kettlebells.
+"""
+
+import heapq
+from dataclasses import dataclass, field
+
+from django.conf import settings
+
+from .models import AVAILABLE_DISCIPLINES, Player
+
+# Minutes an athlete typically occupies a station, changeover included
+DISCIPLINE_MINUTES = {
+    "snatch": 7,
+    "tgu": 6,
+    "see_saw_press": 4,
+    "kb_squat": 4,
+    "pistol_squat": 4,
+}
+
+# Bells an athlete opens each discipline with
+EQUIPMENT_FIELDS = {
+    "snatch": ["snatch_kettlebell_weight"],
+    "tgu": ["tgu_weight_1"],
+    "see_saw_press": ["see_saw_press_weight_left_1", "see_saw_press_weight_right_1"],
+    "kb_squat": ["kb_squat_weight_left_1", "kb_squat_weight_right_1"],
+    "pistol_squat": ["pistol_squat_weight_1"],
+}
+
+BELL_FIELDS = [name for names in EQUIPMENT_FIELDS.values() for name in names]
+
+ORDER_TIME = "time"
+ORDER_EQUIPMENT = "equipment"
+START_LIST_ORDERS = [
+    (ORDER_TIME, "Najdłuższe starty najpierw"),
+    (ORDER_EQUIPMENT, "Najmniej zmian odważników"),
+]
+
+
+def get_discipline_minutes():
+    overrides = getattr(settings, "TOURNAMENT_DISCIPLINE_MINUTES", {})
+    return {**DISCIPLINE_MINUTES, **overrides}
+
+
+@dataclass
+class Athlete:
+    pk: int
+    surname: str
+    name: str
+    categories: list = field(default_factory=list)
+    disciplines: set = field(default_factory=set)
+    bells: dict = field(default_factory=dict)
+    equipment: dict = field(default_factory=dict)
+    minutes: float = 0
+    heat: int = None
+    start: float = None
+
+    @property
+    def category_labels(self):
+        return ", ".join(name.replace("_", " ") for name in self.categories)
+
+    @property
+    def equipment_label(self):
+        labels = dict(AVAILABLE_DISCIPLINES)
+        return ", ".join(
+            f"{labels[discipline]} {'/'.join(f'{bell:g}' for bell in bells)}"
+            for discipline, bells in self.equipment.items()
+        )
+
+
+@dataclass
+class Station:
+    number: int
+    athletes: list = field(default_factory=list)
+    minutes: float = 0
+    equipment_changes: int = 0
+
+
+@dataclass
+class StartList:
+    stations: list
+
+    @property
+    def athletes(self):
+        return [athlete for station in self.stations for athlete in station.athletes]
+
+    @property
+    def minutes(self):
+        """Estimated session time: the busiest station finishes last."""
+        return max((station.minutes for station in self.stations), default=0)
+
+    @property
+    def lower_bound(self):
+        """Session time if the work could be split perfectly evenly."""
+        total = sum(station.minutes for station in self.stations)
+        return total / len(self.stations) if self.stations else 0
+
+    @property
+    def equipment_changes(self):
+        return sum(station.equipment_changes for station in self.stations)
+
+
+def load_athletes(categories):
+    """Return one ``Athlete`` per player entered in any of ``categories``.
+
+    The whole field is read with a single query over the player/category
+    table. Players left with no discipline to perform are skipped.
+    """
+    athletes = {}
+    rows = (
+        Player.categories.through.objects.filter(category__in=categories)
+        .values_list(
+            "player_id",
+            "player__surname",
+            "player__name",
+            "category__name",
+            "category__disciplines",
+            *(f"player__{name}" for name in BELL_FIELDS),
+        )
+        .order_by("player_id", "category__name")
+    )
+    for pk, surname, name, category_name, disciplines, *bells in rows:
+        athlete = athletes.get(pk)
+        if athlete is None:
+            athlete = athletes[pk] = Athlete(pk, surname, name)
+            athlete.bells = dict(zip(BELL_FIELDS, bells))
+        athlete.categories.append(category_name)
+        athlete.disciplines.update(disciplines)
+
+    for athlete in athletes.values():
+        athlete.equipment = get_equipment(athlete)
+    return [athlete for athlete in athletes.values() if athlete.disciplines]
+
+
+def get_equipment(athlete):
+    """Bells needed per discipline, leaving out disciplines with none declared."""
+    equipment = {}
+    for discipline, _ in AVAILABLE_DISCIPLINES:
+        if discipline not in athlete.disciplines:
+            continue
+        bells = tuple(
+            sorted(athlete.bells[name] or 0 for name in EQUIPMENT_FIELDS[discipline])
+        )
+        if any(bells):
+            equipment[discipline] = bells
+    return equipment
+
+
+def _swaps(setup, athlete):
+    return sum(
+        1
+        for discipline, bells in athlete.equipment.items()
+        if setup.get(discipline, bells) != bells
+    )
+
+
+def count_equipment_changes(athletes):
+    """Bell swaps needed to run ``athletes`` in this order on one station.
+
+    The first use of a discipline's bells on a station is setup, not a swap.
+    """
+    changes, setup = 0, {}
+    for athlete in athletes:
+        changes += _swaps(setup, athlete)
+        setup.update(athlete.equipment)
+    return changes
+
+
+def order_by_equipment(athletes):
+    """Sequence ``athletes`` so consecutive ones share as many bells as possible.
+
+    Nearest neighbour: starting from the lightest equipment, the next athlete
+    is always the one needing the fewest swaps from the current setup, ties
+    going to the lighter equipment.
+    """
+    remaining = sorted(
+        athletes,
+        key=lambda a: (
+            [a.equipment.get(d, ()) for d, _ in AVAILABLE_DISCIPLINES],
+            a.surname,
+            a.name,
+            a.pk,
+        ),
+    )
+    ordered, setup = [], {}
+    while remaining:
+        # min() keeps the first of equal candidates, i.e. the lightest
+        athlete = min(remaining, key=lambda a: _swaps(setup, a))
+        remaining.remove(athlete)
+        setup.update(athlete.equipment)
+        ordered.append(athlete)
+    return ordered
+
+
+def build_start_list(athletes, stations, order=ORDER_TIME):
+    """Assign ``athletes`` to ``stations`` and heats, longest first.
+
+    Longest-processing-time scheduling: athletes are taken by decreasing
+    duration and each goes to the station that frees up first, which keeps
+    the busiest station within 4/3 of the optimum. With ``ORDER_EQUIPMENT``
+    each station is then re-sequenced by ``order_by_equipment``, which leaves
+    its load unchanged. A station's n-th athlete competes in heat n. Ties
+    are broken by name, so the plan is deterministic.
+    """
+    minutes = get_discipline_minutes()
+    for athlete in athletes:
+        athlete.minutes = sum(minutes.get(d, 0) for d in athlete.disciplines)
+
+    start_list = StartList([Station(number) for number in range(1, stations + 1)])
+    free_at = [(0, index) for index in range(stations)]
+    for athlete in sorted(
+        athletes, key=lambda a: (-a.minutes, a.surname, a.name, a.pk)
+    ):
+        start, index = heapq.heappop(free_at)
+        station = start_list.stations[index]
+        station.athletes.append(athlete)
+        station.minutes = start + athlete.minutes
+        heapq.heappush(free_at, (station.minutes, index))
+
+    for station in start_list.stations:
+        if order == ORDER_EQUIPMENT:
+            station.athletes = order_by_equipment(station.athletes)
+        start = 0
+        for heat, athlete in enumerate(station.athletes, 1):
+            athlete.heat, athlete.start = heat, start
+            start += athlete.minutes
+        station.equipment_changes = count_equipment_changes(station.athletes)
+    return start_list
@@ -22,3 +22,78 @@
 #     player.save()
 #     # Optionally update or create overall results
 #     # This will depend on your calculation logic and when you want to do this
+
+from django.conf import settings
+from django.db import transaction
+from django.db.backends.signals import connection_created
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete
+from django.dispatch import receiver
+
+from . import results_cache
+from .consumers import broadcast_leaderboard_patch
+from .leaderboards import rebuild_category_leaderboard
+from .models import (
+    Category,
+    Player,
+    SportClub,
+    category_results_changed,
+    refresh_category_rankings,
+)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    pragmas = getattr(settings, "TOURNAMENT_SQLITE_PRAGMAS", {})
+    if connection.vendor != "sqlite" or not pragmas:
+        return
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@receiver(category_results_changed)
+def rebuild_leaderboard(sender, category, **kwargs):
+    leaderboard = rebuild_category_leaderboard(category)
+    if leaderboard.patch is None:
+        return
+    results_cache.invalidate(category.slug)
+    transaction.on_commit(lambda: broadcast_leaderboard_patch(leaderboard))
+
+
+@receiver(post_save, sender=Category)
+def category_saved(sender, instance, raw=False, **kwargs):
+    if not raw:
+        refresh_category_rankings([instance])
+
+
+@receiver(post_save, sender=SportClub)
+def club_saved(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    for category in Category.objects.filter(player__club=instance).distinct():
+        category_results_changed.send(sender=Category, category=category)
+
+
+@receiver(m2m_changed, sender=Player.categories.through)
+def player_categories_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    if action == "pre_clear":
+        instance._cleared_categories = (
+            [instance] if reverse else list(instance.categories.all())
+        )
+    elif action == "post_clear":
+        refresh_category_rankings(instance.__dict__.pop("_cleared_categories", []))
+    elif action in ("post_add", "post_remove"):
+        if reverse:
+            refresh_category_rankings([instance])
+        else:
+            refresh_category_rankings(Category.objects.filter(pk__in=pk_set))
+
+
+@receiver(pre_delete, sender=Player)
+def player_deleting(sender, instance, **kwargs):
+    instance._deleted_categories = list(instance.categories.all())
+
+
+@receiver(post_delete, sender=Player)
+def player_deleted(sender, instance, **kwargs):
+    refresh_category_rankings(instance.__dict__.pop("_deleted_categories", []))
@@ -0,0 +1,169 @@
+"""Compact snapshots for moving the tournament between databases.
+
+A snapshot is a JSON lines file, gzip-compressed when its name ends in
+``.gz``: a header line, then for every table a line naming the model and
+its columns followed by one JSON array per row. Results and leaderboards
+are stored too, so the ranking pass after a restore mostly just verifies
+them and rewrites only the standings that are out of date.
+"""
+
+import gzip
+import json
+from contextlib import contextmanager
+
+from django.core.management.color import no_style
+from django.db import connection, transaction
+
+from .models import (
+    Category,
+    CategoryLeaderboard,
+    CategoryResult,
+    Player,
+    SportClub,
+    update_overall_results,
+)
+
+FORMAT = "tournament-snapshot"
+VERSION = 1
+
+# Every table only refers to the ones before it
+SNAPSHOT_MODELS = [
+    SportClub,
+    Category,
+    Player,
+    Player.categories.through,
+    CategoryResult,
+    CategoryLeaderboard,
+]
+
+BATCH_SIZE = 2000
+
+
+def _columns(model):
+    # Generated columns are computed by the database on insert
+    return [
+        field.attname
+        for field in model._meta.concrete_fields
+        if not getattr(field, "generated", False)
+    ]
+
+
+def _open(path, mode):
+    if str(path).endswith(".gz"):
+        return gzip.open(path, f"{mode}t", encoding="utf-8")
+    return open(path, mode, encoding="utf-8")
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(",", ":"), default=str)
+
+
+@contextmanager
+def _read_transaction():
+    """Read all tables from the same state without blocking writers.
+
+    ``atomic()`` would take SQLite's write lock up front when the database
+    uses ``transaction_mode = "IMMEDIATE"``; a deferred transaction only
+    takes a shared lock, and none at all in WAL mode.
+    """
+    if connection.vendor != "sqlite":
+        with transaction.atomic():
+            yield
+        return
+    if connection.in_atomic_block:
+        yield
+        return
+    with connection.cursor() as cursor:
+        cursor.execute("BEGIN DEFERRED")
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("COMMIT")
+
+
+def write_snapshot(path):
+    """Write the tournament to ``path``; returns the row count per model."""
+    counts = {}
+    with _read_transaction(), _open(path, "w") as f:
+        f.write(_dumps({"format": FORMAT, "version": VERSION}) + "\n")
+        for model in SNAPSHOT_MODELS:
+            label = model._meta.label_lower
+            columns = _columns(model)
+            f.write(_dumps({"model": label, "columns": columns}) + "\n")
+            rows = model.objects.order_by("pk").values_list(*columns)
+            counts[label] = 0
+            for row in rows.iterator(chunk_size=BATCH_SIZE):
+                f.write(_dumps(row) + "\n")
+                counts[label] += 1
+    return counts
+
+
+def read_snapshot(path):
+    """Yield ``(model, instances)`` batches from the snapshot at ``path``."""
+    models = {model._meta.label_lower: model for model in SNAPSHOT_MODELS}
+    with _open(path, "r") as f:
+        try:
+            header = json.loads(f.readline())
+        except json.JSONDecodeError:
+            header = None
+        if not isinstance(header, dict) or header.get("format") != FORMAT:
+            raise ValueError(f"{path} is not a tournament snapshot")
+        if header.get("version") != VERSION:
+            raise ValueError(f"Unsupported snapshot version: {header.get('version')}")
+
+        model, fields, batch = None, [], []
+        for line in f:
+            value = json.loads(line)
+            if isinstance(value, dict):
+                if batch:
+                    yield model, batch
+                model = models.get(value["model"])
+                if model is None:
+                    raise ValueError(f"Unknown model in snapshot: {value['model']}")
+                fields = [model._meta.get_field(name) for name in value["columns"]]
+                batch = []
+                continue
+            batch.append(
+                model(
+                    **{
+                        field.attname: field.to_python(item)
+                        for field, item in zip(fields, value)
+                    }
+                )
+            )
+            if len(batch) >= BATCH_SIZE:
+                yield model, batch
+                batch = []
+        if batch:
+            yield model, batch
+
+
+def restore_snapshot(path):
+    """Replace the tournament with the snapshot at ``path``.
+
+    Tables are emptied with the backend's flush SQL and refilled with
+    ``bulk_create`` in dependency order, so neither ``Player.save`` nor the
+    ranking signals run while loading. Every category is ranked once at
+    the end. Returns the row count per model.
+    """
+    tables = [model._meta.db_table for model in SNAPSHOT_MODELS]
+    counts = {model._meta.label_lower: 0 for model in SNAPSHOT_MODELS}
+    with transaction.atomic():
+        connection.ops.execute_sql_flush(
+            connection.ops.sql_flush(no_style(), tables, allow_cascade=True)
+        )
+        for model, instances in read_snapshot(path):
+            model.objects.bulk_create(instances)
+            counts[model._meta.label_lower] += len(instances)
+
+        sequence_sql = connection.ops.sequence_reset_sql(no_style(), SNAPSHOT_MODELS)
+        if sequence_sql:
+            with connection.cursor() as cursor:
+                for sql in sequence_sql:
+                    cursor.execute(sql)
+
+        Category.objects.update(rankings_dirty_since=None)
+        for category in Category.objects.all():
+            update_overall_results(category)
+    return counts
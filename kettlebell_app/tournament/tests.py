@@ -0,0 +1,292 @@
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+import tablib
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ValidationError
+from django.forms.models import model_to_dict
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+
+from . import metrics, models, results_cache, views
+from .checks import IN_MEMORY_LAYER, check_channel_layer
+from .contention import BASELINE, worker_settings
+from .models import Category, CategoryResult, Player, SportClub
+from .resources import PlayerImportResource
+from .routing import websocket_urlpatterns
+
+
+class TournamentTestCase(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.club = SportClub.objects.create(name="KS Bochnia")
+        cls.category = Category.objects.create(
+            name="Kobiety_do_65kg", disciplines=["tgu", "snatch"]
+        )
+        cls.players = []
+        for index, tgu in enumerate([16, 12, 8], 1):
+            player = Player.objects.create(
+                name=f"Zawodniczka{index}",
+                surname="Testowa",
+                club=cls.club,
+                tgu_weight_1=tgu,
+            )
+            player.categories.add(cls.category)
+            cls.players.append(player)
+
+    def get_result(self, player):
+        return CategoryResult.objects.get(player=player, category=self.category)
+
+
+class CategorySlugTests(TournamentTestCase):
+    def test_names_with_the_same_slug_get_distinct_slugs(self):
+        category = Category.objects.create(name="Kobiety do 65kg")
+        self.assertEqual(category.slug, "kobiety-do-65kg-2")
+        url = reverse("category_results", args=[category.slug])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+    def test_import_creates_distinct_slugs(self):
+        dataset = tablib.Dataset(
+            ["Anna", "Nowak", "KS Bochnia", "Kobiety do 65kg"],
+            ["Ewa", "Kowal", "KS Bochnia", "Kobiety-do-65kg, Kobiety do 65 kg"],
+            headers=["Imię", "Nazwisko", "Klub", "Kategoria"],
+        )
+        result = PlayerImportResource().import_data(dataset, raise_errors=True)
+        self.assertFalse(result.has_errors())
+        self.assertCountEqual(
+            Category.objects.values_list("slug", flat=True),
+            [
+                "kobiety-do-65kg",
+                "kobiety-do-65kg-2",
+                "kobiety-do-65kg-3",
+                "kobiety-do-65-kg",
+            ],
+        )
+
+    def test_reserved_and_empty_names_rejected(self):
+        for name in ["metrics", "Export", "cache_stats", "admin", "!!!"]:
+            with self.subTest(name=name), self.assertRaises(ValidationError):
+                Category.objects.create(name=name)
+        with self.assertRaises(ValidationError):
+            Category.objects.create(name="Metryki", slug="metrics")
+        self.assertEqual(Category.objects.count(), 1)
+
+
+class ResultsPageTests(TournamentTestCase):
+    def test_cached_page_runs_no_queries(self):
+        url = reverse("category_results", args=[self.category.slug])
+        page = self.client.get(url).content
+        with self.assertNumQueries(0):
+            response = self.client.get(url)
+        self.assertEqual(response.content, page)
+
+    def test_unknown_category_is_not_found(self):
+        self.assertEqual(self.client.get("/no-such-category/").status_code, 404)
+
+
+class ChangedFieldsTests(TournamentTestCase):
+    def test_refresh_from_db_resets_loaded_values(self):
+        player = Player.objects.get(pk=self.players[0].pk)
+        Player.objects.filter(pk=player.pk).update(tgu_weight_1=24)
+        player.refresh_from_db()
+        self.assertEqual(player.get_changed_fields(), set())
+
+        club = SportClub.objects.create(name="KS Kraków")
+        Player.objects.filter(pk=player.pk).update(club=club)
+        player.snatch_repetitions = 30
+        player.refresh_from_db(fields=["tgu_weight_1", "club_id"])
+        self.assertEqual(player.club_id, club.pk)
+        self.assertEqual(player.get_changed_fields(), {"snatch_repetitions"})
+
+    def test_save_with_attname_update_fields(self):
+        player = Player.objects.get(pk=self.players[0].pk)
+        player.club = SportClub.objects.create(name="KS Kraków")
+        player.save(update_fields=["club_id"])
+        self.assertEqual(player.get_changed_fields(), set())
+
+    def test_deferred_field_load_is_not_a_change(self):
+        player = Player.objects.only("pk", "name").get(pk=self.players[0].pk)
+        player.tgu_weight_1
+        self.assertEqual(player.get_changed_fields(), set())
+
+
+class PlayerSaveQueryTests(TournamentTestCase):
+    def test_save_of_one_discipline(self):
+        player = Player.objects.get(pk=self.players[2].pk)
+        player.tgu_weight_2 = 20
+        # One ranking pass and one leaderboard rebuild for its only category
+        with self.assertNumQueries(16):
+            player.save()
+        self.assertEqual(self.get_result(player).tgu_position, 1)
+
+    def test_admin_change_of_one_discipline(self):
+        player = self.players[2]
+        self.client.force_login(
+            User.objects.create_superuser("admin", "admin@example.com", "admin")
+        )
+        data = {
+            name: "" if value is None else value
+            for name, value in model_to_dict(player).items()
+            if name != "id"
+        }
+        data.update(
+            categories=[self.category.pk], tgu_weight_2=20, tiebreak="", _save=1
+        )
+        url = reverse("admin:tournament_player_change", args=[player.pk])
+        # Player.save() is the only write path; the admin adds no result writes
+        with self.assertNumQueries(27):
+            response = self.client.post(url, data)
+        self.assertEqual(response.status_code, 302)
+        self.assertEqual(self.get_result(player).tgu_position, 1)
+
+
+@override_settings(TOURNAMENT_DEFER_RANKINGS=True)
+class DeferredRankingsTests(TournamentTestCase):
+    def test_save_marks_category_dirty(self):
+        player = self.players[2]
+        player.tgu_weight_1 = 24
+        player.save()
+
+        self.category.refresh_from_db()
+        self.assertIsNotNone(self.category.rankings_dirty_since)
+        models.recompute_dirty_rankings()
+
+        self.category.refresh_from_db()
+        self.assertIsNone(self.category.rankings_dirty_since)
+        self.assertEqual(self.get_result(player).tgu_position, 1)
+
+    def test_mark_during_recompute_keeps_category_dirty(self):
+        models.mark_rankings_dirty([self.category])
+        player = self.players[2]
+        recompute = models.update_overall_results
+
+        def save_while_recomputing(category):
+            recompute(category)
+            # Saved after the worker read the category, before it clears it
+            player.tgu_weight_1 = 24
+            player.save()
+
+        with mock.patch.object(
+            models, "update_overall_results", side_effect=save_while_recomputing
+        ):
+            self.assertEqual(models.recompute_dirty_rankings(), [self.category])
+
+        self.category.refresh_from_db()
+        self.assertIsNotNone(self.category.rankings_dirty_since)
+        self.assertEqual(self.get_result(player).tgu_position, 3)
+
+        models.recompute_dirty_rankings()
+        self.category.refresh_from_db()
+        self.assertIsNone(self.category.rankings_dirty_since)
+        self.assertEqual(self.get_result(player).tgu_position, 1)
+
+
+class ChannelLayerCheckTests(SimpleTestCase):
+    in_memory = {"default": {"BACKEND": IN_MEMORY_LAYER}}
+
+    @override_settings(TOURNAMENT_SHARED_CHANNEL_LAYER=True, CHANNEL_LAYERS=in_memory)
+    def test_in_memory_layer_warned_about_when_shared_layer_required(self):
+        errors = check_channel_layer(None)
+        self.assertEqual([error.id for error in errors], ["tournament.W001"])
+
+    @override_settings(TOURNAMENT_SHARED_CHANNEL_LAYER=False, CHANNEL_LAYERS=in_memory)
+    def test_in_memory_layer_allowed_otherwise(self):
+        self.assertEqual(check_channel_layer(None), [])
+
+
+class MetricsTests(TournamentTestCase):
+    def test_category_pages_labelled_by_category(self):
+        url = reverse("category_results", args=[self.category.slug])
+        directory = self.enterContext(TemporaryDirectory())
+        with self.settings(
+            TOURNAMENT_PROFILE_SAMPLE_RATE=1, TOURNAMENT_PROFILE_DIR=directory
+        ):
+            self.assertEqual(self.client.get(url).status_code, 200)
+            self.assertEqual(self.client.get("/no-such-category/").status_code, 404)
+            profiles = [path.name for path in Path(directory).iterdir()]
+
+        exposed = metrics.render()
+        self.assertIn(
+            'view="category_results",category="kobiety-do-65kg",method="GET",'
+            'status="200"',
+            exposed,
+        )
+        self.assertIn(
+            'view="category_results",category="",method="GET",status="404"',
+            exposed,
+        )
+        self.assertTrue(
+            any("-category_results-kobiety-do-65kg-" in name for name in profiles)
+        )
+
+    def test_only_slowest_profiles_kept(self):
+        directory = self.enterContext(TemporaryDirectory())
+        slowest = metrics.SlowestProfiles()
+        profile = mock.Mock()
+        profile.dump_stats.side_effect = lambda path: Path(path).touch()
+        with self.settings(TOURNAMENT_PROFILE_DIR=directory, TOURNAMENT_PROFILE_KEEP=2):
+            for seconds in [0.2, 0.1, 0.3, 0.05, 0.4]:
+                slowest.keep(profile, seconds, "category_results")
+
+        self.assertEqual(profile.dump_stats.call_count, 4)
+        self.assertCountEqual(
+            [path.name.split("-")[0] for path in Path(directory).iterdir()],
+            ["300ms", "400ms"],
+        )
+
+
+class ResultsConsumerTests(TournamentTestCase):
+    async def test_malformed_frames_get_an_error(self):
+        communicator = WebsocketCommunicator(
+            URLRouter(websocket_urlpatterns), f"/ws/{self.category.slug}/"
+        )
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        self.assertEqual(
+            (await communicator.receive_json_from())["type"], "leaderboard"
+        )
+
+        for frame in ["{not json", "[1, 2]", '"snapshot"']:
+            await communicator.send_to(text_data=frame)
+            self.assertEqual(
+                await communicator.receive_json_from(),
+                {"type": "error", "error": "Expected a JSON object"},
+            )
+        await communicator.send_to(bytes_data=b"\x00")
+        self.assertEqual((await communicator.receive_json_from())["type"], "error")
+
+        # The socket stays usable
+        await communicator.send_json_to({"type": "snapshot"})
+        self.assertEqual(
+            (await communicator.receive_json_from())["type"], "leaderboard"
+        )
+        await communicator.disconnect()
+
+
+class ContentionWorkerTests(TournamentTestCase):
+    def test_worker_leaves_live_cache_and_channel_layer_alone(self):
+        live_cache = caches["default"]
+        live_cache.set("sentinel", "live")
+        live_layer = get_channel_layer()
+        generation = f"results:{self.category.slug}:generation"
+
+        with mock.patch.object(live_layer, "group_send") as group_send:
+            with worker_settings(BASELINE):
+                self.assertIsNot(get_channel_layer(), live_layer)
+                player = Player.objects.get(pk=self.players[2].pk)
+                player.tgu_weight_1 = 24
+                with self.captureOnCommitCallbacks(execute=True):
+                    player.save()
+                views.calculate_category_results(
+                    RequestFactory().get("/"), self.category.slug
+                )
+                results_cache._cache().clear()
+
+        group_send.assert_not_called()
+        self.assertEqual(caches["default"].get("sentinel"), "live")
+        self.assertIsNone(caches["default"].get(generation))
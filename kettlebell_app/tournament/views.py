@@ -1,368 +1,132 @@
-from django.shortcuts import render
-
-from .forms import StationForm
-from .models import (
-    BestKBSquatResult,
-    BestSeeSawPressResult,
-    Category,
-    KBSquatResult,
-    OverallResult,
-    PistolSquatResult,
-    Player,
-    SeeSawPressResult,
-    SnatchResult,
-    TGUResult,
+from django.contrib.admin.views.decorators import staff_member_required
+from django.http import (
+    Http404,
+    HttpResponse,
+    HttpResponseBadRequest,
+    JsonResponse,
+    StreamingHttpResponse,
 )
+from django.shortcuts import get_object_or_404, redirect, render
 
+from . import metrics, results_cache
+from .exports import EXPORT_FORMATS, get_export_categories, iter_export
+from .forms import ResultsSheetForm, StationForm, results_sheet_formset
+from .leaderboards import get_category_leaderboard
+from .models import AVAILABLE_DISCIPLINES, Category, Player, bulk_update_results
 
-def create_or_update_results(category):
-    for player in Player.objects.filter(categories=category):
-        # Snatch
-        SnatchResult.objects.update_or_create(
-            player=player, defaults={"result": player.snatch_results() or 0}
-        )
-
-        # TGU
-        TGUResult.objects.update_or_create(
-            player=player,
-            defaults={
-                "result_1": player.tgu_weight_1 or 0,
-                "result_2": player.tgu_weight_2 or 0,
-                "result_3": player.tgu_weight_3 or 0,
-            },
-        )
-
-        # See Saw Press
-        SeeSawPressResult.objects.update_or_create(
-            player=player,
-            defaults={
-                "result_left_1": player.see_saw_press_body_percent_weight_left(1) or 0,
-                "result_right_1": player.see_saw_press_body_percent_weight_right(1)
-                or 0,
-                "result_left_2": player.see_saw_press_body_percent_weight_left(2) or 0,
-                "result_right_2": player.see_saw_press_body_percent_weight_right(2)
-                or 0,
-                "result_left_3": player.see_saw_press_body_percent_weight_left(3) or 0,
-                "result_right_3": player.see_saw_press_body_percent_weight_right(3)
-                or 0,
-            },
-        )
-
-        # KB Squat
-        KBSquatResult.objects.update_or_create(
-            player=player,
-            defaults={
-                "result_left_1": player.kb_squat_body_percent_weight("left", 1),
-                "result_right_1": player.kb_squat_body_percent_weight("right", 1),
-                "result_left_2": player.kb_squat_body_percent_weight("left", 2),
-                "result_right_2": player.kb_squat_body_percent_weight("right", 2),
-                "result_left_3": player.kb_squat_body_percent_weight("left", 3),
-                "result_right_3": player.kb_squat_body_percent_weight("right", 3),
-            },
-        )
+CATEGORY_RESULTS_TEMPLATE = "category_results.html"
 
-        # Pistol Squat
-        PistolSquatResult.objects.update_or_create(
-            player=player,
-            defaults={
-                "result_1": player.pistol_squat_weight_1 or 0,
-                "result_2": player.pistol_squat_weight_2 or 0,
-                "result_3": player.pistol_squat_weight_3 or 0,
-            },
-        )
-
-        # Update best results
-        BestSeeSawPressResult.objects.update_or_create(player=player, defaults={})
-        BestKBSquatResult.objects.update_or_create(player=player, defaults={})
-
-        # The update methods will be called in the save() method of these models
-        player.bestseesawpressresult.update_best_results()
-        player.bestkbsquatresult.update_best_result()
-
-
-def calculate_positions(result_model, category):
-    results = result_model.objects.filter(player__categories=category).order_by(
-        "-result"
-    )
-    for position, result in enumerate(results, start=1):
-        result.position = position
-        result.save()
-
-
-def update_overall_results(category):
-    disciplines = category.get_disciplines()
-    for player in Player.objects.filter(categories=category):
-        overall, created = OverallResult.objects.get_or_create(player=player)
-
-        if "snatch" in disciplines:
-            snatch_results = SnatchResult.objects.filter(player=player).first()
-            overall.snatch_points = snatch_results.position if snatch_results else 0
-        else:
-            overall.snatch_points = 0
-
-        overall.calculate_total_points()
-        overall.save()
+# Home page sections, each holding the categories whose name contains its key
+INDEX_GROUPS = {"Kobiety": "Kobiety", "Mężczyźni": "Mężczyźni", "Bochnia": "Bochni"}
+OTHER_GROUP = "Pozostałe"
 
 
 def index(request):
-    categories = Category.objects.all()
-    return render(request, "index.html", {"categories": categories})
-
-
-def category_view(request, category_slug):
-    category_mapping = {
-        "amator-kobiety-do-65kg": "Amator_Kobiety_do_65kg",
-        "amator-kobiety-powyzej-65kg": "Amator_Kobiety_powyżej_65kg",
-        "amator-mezczyzni-do-85kg": "Amator_Mężczyźni_do_85kg",
-        "amator-mezczyzni-powyzej-85kg": "Amator_Mężczyźni_powyżej_85kg",
-        "masters-kobiety": "Masters_Kobiety",
-        "masters-mezczyzni": "Masters_Mężczyźni",
-        "najlepsza-bochnianka": "Najlepsza_Bochnianka",
-        "najlepszy-bochnianin": "Najlepszy_Bochnianin",
-        "pro-kobiety": "Pro_Kobiety",
-        "pro-mezczyzni-do-85kg": "Pro_Mężczyźni_do_85kg",
-        "pro-mezczyzni-powyzej-85kg": "Pro_Mężczyźni_powyżej_85kg",
-    }
-
-    category_name = category_mapping.get(category_slug)
-    if not category_name:
-        return render(request, "404.html", status=404)
-
-    category = Category.objects.get(name=category_name)
-    results = OverallResult.objects.filter(player__categories=category).order_by(
-        "final_position"
-    )
-
-    context = {
-        "category_name": category_name,
-        "results": results,
-    }
-
-    return render(request, "category_template.html", context)
-
-
-def calculate_category_results(request, category_name, template_name):
-    category = Category.objects.get(name=category_name)
-    players = Player.objects.filter(categories=category)
-    disciplines = category.get_disciplines()
-
-    discipline_configs = {
-        "snatch": {
-            "model": SnatchResult,
-            "calculate": lambda player, result: {
-                "max_result": result.result or 0,
-                "kettlebell_weight": player.snatch_kettlebell_weight,
-                "repetitions": player.snatch_repetitions,
-            },
-        },
-        "tgu": {
-            "model": TGUResult,
-            "calculate": lambda player, result: {
-                "max_result": result.get_max_result(),
-                "bw_percentage": round(result.calculate_bw_percentage(), 2),
-                "attempt_1": result.result_1,
-                "attempt_2": result.result_2,
-                "attempt_3": result.result_3,
-            },
-        },
-        "see_saw_press": {
-            "model": SeeSawPressResult,
-            "calculate": lambda player, result: {
-                "max_result": result.get_max_result(),
-                "bw_percentage": round(
-                    (result.get_max_result() / player.weight) * 100, 1
-                )
-                if player.weight
-                else 0,
-                "attempt_1": f"{result.result_left_1:.1f}/{result.result_right_1:.1f}",
-                "attempt_2": f"{result.result_left_2:.1f}/{result.result_right_2:.1f}",
-                "attempt_3": f"{result.result_left_3:.1f}/{result.result_right_3:.1f}",
-            },
-        },
-        "kb_squat": {
-            "model": KBSquatResult,
-            "calculate": lambda player, result: {
-                "max_result": result.get_max_result(),
-                "bw_percentage": round(
-                    (result.get_max_result() / player.weight) * 100, 1
-                )
-                if player.weight
-                else 0,
-                "attempt_1": f"{result.result_left_1:.1f}/{result.result_right_1:.1f}",
-                "attempt_2": f"{result.result_left_2:.1f}/{result.result_right_2:.1f}",
-                "attempt_3": f"{result.result_left_3:.1f}/{result.result_right_3:.1f}",
-            },
-        },
-        "pistol_squat": {
-            "model": PistolSquatResult,
-            "calculate": lambda player, result: {
-                "max_result": result.get_max_result(),
-                "bw_percentage": round(result.calculate_bw_percentage(), 2),
-                "attempt_1": result.result_1,
-                "attempt_2": result.result_2,
-                "attempt_3": result.result_3,
-            },
-        },
-    }
-
-    results = {discipline: [] for discipline in disciplines}
-    overall_results = []
-
-    for player in players:
-        player_results = {"player": player, "weight": player.weight}
-        total_points = 0
-
-        for discipline in disciplines:
-            config = discipline_configs.get(discipline)
-            if config:
-                result = config["model"].objects.filter(player=player).first()
-                if result:
-                    try:
-                        discipline_result = {
-                            "player": player,
-                            "weight": player.weight,
-                            **config["calculate"](player, result),
-                        }
-                        results[discipline].append(discipline_result)
-                    except Exception as e:
-                        print(
-                            f"Error calculating results for {player} in {discipline}: {e}"
-                        )
-                        player_results[f"{discipline}_place"] = 0
-                else:
-                    player_results[f"{discipline}_place"] = 0
-            else:
-                player_results[f"{discipline}_place"] = 0
-
-        overall_results.append(player_results)
-
-    for discipline in disciplines:
-        results[discipline].sort(key=lambda x: x["max_result"], reverse=True)
-        current_position = 1
-        previous_result = None
-        for index, result in enumerate(results[discipline]):
-            if (
-                previous_result is not None
-                and result["max_result"] != previous_result["max_result"]
-            ):
-                current_position = index + 1
-            result["position"] = current_position
-            for overall_result in overall_results:
-                if overall_result["player"] == result["player"]:
-                    overall_result[f"{discipline}_place"] = current_position
-                    overall_result["total_points"] = (
-                        overall_result.get("total_points", 0) + current_position
-                    )
-            previous_result = result
-
-    overall_results.sort(
-        key=lambda x: (x.get("total_points", 0), not x["player"].tiebreak)
-    )
-    current_position = 1
-    previous_score = None
-    for index, result in enumerate(overall_results):
-        result["final_score"] = (
-            result.get("total_points", 0) - 0.5
-            if result["player"].tiebreak
-            else result.get("total_points", 0)
+    groups = {title: [] for title in [*INDEX_GROUPS, OTHER_GROUP]}
+    for category in Category.objects.order_by("name"):
+        # Categories without disciplines (e.g. absentees) have no results page
+        if not category.disciplines:
+            continue
+        category.label = category.name.replace("_", " ")
+        title = next(
+            (title for title, key in INDEX_GROUPS.items() if key in category.name),
+            OTHER_GROUP,
         )
-        if previous_score is not None and result["final_score"] != previous_score:
-            current_position = index + 1
-        result["total_place"] = current_position
-        previous_score = result["final_score"]
-
-    overall_results.sort(key=lambda x: x["final_score"])
-
-    current_position = 1
-    previous_score = None
-    for index, result in enumerate(overall_results):
-        if previous_score is not None and result["final_score"] != previous_score:
-            current_position = index + 1
-        result["final_place"] = current_position
-        previous_score = result["final_score"]
-
-    context = {
-        "category_name": category_name,
-        "overall_results": overall_results,
-        "disciplines": disciplines,
-        "snatch_results": results.get("snatch", []),
-        "tgu_results": results.get("tgu", []),
-        "see_saw_results": results.get("see_saw_press", []),
-        "kb_squat_results": results.get("kb_squat", []),
-        "pistol_squat_results": results.get("pistol_squat", []),
-    }
-
-    return render(request, template_name, context)
-
-
-def amator_kobiety_do_65kg(request):
-    return calculate_category_results(
-        request, "Amator_Kobiety_do_65kg", "amator-kobiety-do-65kg.html"
-    )
+        groups[title].append(category)
+    category_groups = [(title, items) for title, items in groups.items() if items]
+    return render(request, "index.html", {"category_groups": category_groups})
 
 
-def amator_kobiety_powyzej_65kg(request):
-    return calculate_category_results(
-        request, "Amator_Kobiety_powyżej_65kg", "amator-kobiety-powyzej-65kg.html"
-    )
+def category_results(request, category_slug):
+    return calculate_category_results(request, category_slug)
 
 
-def amator_mezczyzni_do_85kg(request):
-    return calculate_category_results(
-        request, "Amator_Mężczyźni_do_85kg", "amator-mezczyzni-do-85kg.html"
-    )
+def calculate_category_results(
+    request, category_slug, template_name=CATEGORY_RESULTS_TEMPLATE
+):
+    """Serve a category's results page; cache hits run no queries."""
 
+    def render_page():
+        category = get_object_or_404(Category.objects.only("name"), slug=category_slug)
+        data = results_cache.get_or_set(
+            category_slug,
+            "context",
+            lambda: get_category_leaderboard(category.name).data,
+        )
+        context = {"category_name": category.name, **data}
+        return render(request, template_name, context).content
 
-def amator_mezczyzni_powyzej_85kg(request):
-    return calculate_category_results(
-        request, "Amator_Mężczyźni_powyżej_85kg", "amator-mezczyzni-powyzej-85kg.html"
-    )
+    return HttpResponse(results_cache.get_or_set(category_slug, "page", render_page))
 
 
-def masters_kobiety(request):
-    return calculate_category_results(
-        request, "Masters_Kobiety", "masters-kobiety.html"
-    )
+@staff_member_required
+def results_sheet(request):
+    selection_form = ResultsSheetForm(request.GET or None)
+    if not selection_form.is_valid():
+        return render(request, "results_sheet_form.html", {"form": selection_form})
 
-
-def masters_mezczyzni(request):
-    return calculate_category_results(
-        request, "Masters_Mężczyźni", "masters-mezczyzni.html"
+    category_name = selection_form.cleaned_data["category"]
+    discipline = selection_form.cleaned_data["discipline"]
+    players = Player.objects.filter(categories__name=category_name).order_by(
+        "surname", "name"
     )
+    formset_class = results_sheet_formset(discipline)
 
-
-def najlepsza_bochnianka(request):
-    return calculate_category_results(
-        request, "Najlepsza_Bochnianka", "najlepsza-bochnianka.html"
+    if request.method == "POST":
+        formset = formset_class(request.POST, queryset=players)
+        if formset.is_valid():
+            changed_players = formset.save(commit=False)
+            bulk_update_results(changed_players, formset.form._meta.fields)
+            return redirect(request.get_full_path())
+    else:
+        formset = formset_class(queryset=players)
+
+    return render(
+        request,
+        "results_sheet.html",
+        {
+            "formset": formset,
+            "category": category_name,
+            "discipline": dict(AVAILABLE_DISCIPLINES)[discipline],
+        },
     )
 
 
-def najlepszy_bochnianin(request):
-    return calculate_category_results(
-        request, "Najlepszy_Bochnianin", "najlepszy-bochnianin.html"
-    )
+@staff_member_required
+def results_cache_stats(request):
+    return JsonResponse(results_cache.get_stats())
 
 
-def pro_kobiety(request):
-    return calculate_category_results(request, "Pro_Kobiety", "pro-kobiety.html")
+def prometheus_metrics(request):
+    if not metrics.is_authorized(request):
+        return HttpResponse("Brak dostępu", status=403, content_type="text/plain")
+    return HttpResponse(metrics.render(), content_type=metrics.CONTENT_TYPE)
 
 
-def pro_mezczyzni_do_85kg(request):
-    return calculate_category_results(
-        request, "Pro_Mężczyźni_do_85kg", "pro-mezczyzni-do-85kg.html"
-    )
+@staff_member_required
+def export_results(request):
+    export_format = request.GET.get("format", "csv")
+    if export_format not in EXPORT_FORMATS:
+        return HttpResponseBadRequest(f"Nieznany format eksportu: {export_format}")
+    category_slug = request.GET.get("category") or None
+    categories = get_export_categories(category_slug)
+    if not categories:
+        raise Http404("Nie znaleziono kategorii")
 
-
-def pro_mezczyzni_powyzej_85kg(request):
-    return calculate_category_results(
-        request, "Pro_Mężczyźni_powyżej_85kg", "pro-mezczyzni-powyzej-85kg.html"
+    response = StreamingHttpResponse(
+        iter_export(export_format, categories),
+        content_type=EXPORT_FORMATS[export_format],
     )
+    filename = f"wyniki-{category_slug or 'wszystkie'}.{export_format}"
+    response["Content-Disposition"] = f'attachment; filename="{filename}"'
+    return response
 
 
 from django.shortcuts import render
 
 from .forms import StationForm
-from .models import Category, Player
+from .models import Category
+from .scheduling import build_start_list, load_athletes
 
 
 def generate_start_list(request):
@@ -371,46 +135,34 @@ def generate_start_list(request):
         if form.is_valid():
             category_name = form.cleaned_data["category"]
             stations = form.cleaned_data["stations"]
+            order = form.cleaned_data["order"]
 
-            category = Category.objects.get(name=category_name)
-            players = Player.objects.filter(categories=category).order_by(
-                "surname", "name"
-            )
-            player_count = players.count()
-
-            if stations == 0:
-                form.add_error("stations", "Liczba stanowisk musi być większa od 0.")
-                return render(request, "station_form.html", {"form": form})
+            if category_name:
+                categories = Category.objects.filter(name=category_name)
+                title = category_name
+            else:
+                categories = Category.objects.all()
+                title = "Wszystkie kategorie"
+            athletes = load_athletes(categories)
 
-            if player_count == 0:
+            if not athletes:
                 return render(
                     request,
                     "start_list.html",
                     {
-                        "message": f"Brak zawodników w kategorii {category_name}.",
-                        "category": category_name,
+                        "message": f"Brak zawodników w kategorii {title}.",
+                        "category": title,
                         "stations": stations,
                     },
                 )
 
-            players_per_station = (player_count + stations - 1) // stations
-            stations_list = [
-                {
-                    "station_number": i + 1,
-                    "players": players[
-                        i * players_per_station : (i + 1) * players_per_station
-                    ],
-                }
-                for i in range(stations)
-            ]
-
             return render(
                 request,
                 "start_list.html",
                 {
-                    "stations_list": stations_list,
+                    "start_list": build_start_list(athletes, stations, order),
                     "stations": stations,
-                    "category": category_name,
+                    "category": title,
                 },
             )
     else: